@@ -11,12 +11,14 @@ Raises:
 """
 
 # --------------------------------------------------------------
+import datetime
+import functools
+import itertools
 import json
 import os
-import pandas as pd
-from typing import Any
+import sys
+from typing import Any, Callable, NoReturn
 import re
-import copy
 import traceback
 
 # --------------------------------------------------------------
@@ -52,6 +54,8 @@ ADD_PREFIX_KEY: str = "add prefix"
 SORT_BY_KEY: str = "by"
 """Key to identify sorting columns in the metadata file."""
 ASCENDING_SORT_KEY: str = "ascending"
+LOG_TITLE_STRIP: re.Pattern[str] = re.compile(r"%\(|\)[sd]")
+"""Pattern matching the logging syntax to be removed from log format items to build the log titles."""
 
 # --------------------------------------------------------------
 # Define the structure of complex types
@@ -76,10 +80,108 @@ TABLE_ASSOCIATION_SCHEMA: dict[str, type] = {
 }
 
 
+# --------------------------------------------------------------
+@functools.lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a regex pattern, reusing the compiled object for repeated patterns across Config instances.
+
+    Args:
+        pattern (str): Regex pattern to compile.
+
+    Returns:
+        re.Pattern[str]: Compiled regex pattern.
+
+    Raises:
+        re.error: If the pattern is invalid.
+    """
+
+    return re.compile(pattern)
+
+
+# --------------------------------------------------------------
+def _exit_with_error(message: str) -> NoReturn:
+    """Print an error message and exit. Used for configuration errors that prevent startup.
+
+    Args:
+        message (str): Error message to be printed.
+
+    Raises:
+        SystemExit: Always, with exit code 1.
+    """
+
+    print(f"\n\n{message}")
+    sys.exit(1)
+
+
 # --------------------------------------------------------------
 class Config:
     """Class to load and store the configuration values from a JSON file."""
 
+    __slots__ = (
+        "config_file",
+        "raw",
+        "name",
+        "scarab_version",
+        "test_mode",
+        "check_period",
+        "clean_period",
+        "last_clean",
+        "maximum_errors_before_exit",
+        "maximum_file_variations",
+        "character_scope",
+        "_character_scope_sub",
+        "languages",
+        "null_string_values",
+        "default_worksheet_key",
+        "default_multiple_object_key",
+        "default_unlimited_characters_scope",
+        "default_worksheet_name",
+        "store_data_overwrite",
+        "get_data_overwrite",
+        "trash_data_overwrite",
+        "discard_invalid_data_files",
+        "mirror_hard_links",
+        "log_level",
+        "log_to_screen",
+        "log_to_file",
+        "log_file_path",
+        "_log_separator",
+        "_log_format",
+        "_colour_sequence",
+        "_log_file_format",
+        "_log_screen_format",
+        "_log_title",
+        "log_overwrite",
+        "temp",
+        "input_path_list",
+        "trash",
+        "store",
+        "get",
+        "catalog_files",
+        "metadata_file_regex",
+        "data_file_regex",
+        "catalog_extension",
+        "input_to_ignore",
+        "csv_separator",
+        "table_names",
+        "sheet_names",
+        "required_tables",
+        "key_columns",
+        "table_associations",
+        "unassociated_tables",
+        "force_table_identification",
+        "required_columns",
+        "rows_sort_by",
+        "columns_data_filenames",
+        "columns_data_published",
+        "expected_columns_in_files",
+        "add_filename",
+        "add_timestamp",
+        "filename_data_format",
+        "filename_data_processing_rules",
+    )
+    """Fixed attribute set. Avoids a per-instance __dict__ and speeds up attribute access."""
+
     def __init__(self, filename: str) -> None:
         """Load the configuration values from a JSON file encoded with UTF-8.
 
@@ -97,8 +199,9 @@ class Config:
         self.config_file = filename
         """Configuration file name."""
         config: dict[str, Any] = self._load_into_config(filename)
-        self.raw: dict[str, Any] = copy.deepcopy(config)
-        """Raw configuration values."""
+        # JSON round trip is enough to detach the raw tree, since it only holds JSON types
+        self.raw: dict[str, Any] = json.loads(json.dumps(config))
+        """Raw configuration values. Written back to the config file by set_last_clean."""
         # Ensure mandatory keys exist in config
         config = self._ensure_mandatory_structure(config)
 
@@ -108,124 +211,132 @@ class Config:
         default_conf = self._load_into_config(default_conf_file)
 
         try:
-            self.name: str = config.pop("name", default_conf["name"])
+            self.name: str = self._pop_or_default(config, "name", default_conf)
             """ Name of the config used for logging and default worksheet naming"""
-            self.scarab_version: str = config.pop(
-                "scarab version", default_conf["scarab version"]
+            self.scarab_version: str = self._pop_or_default(
+                config, "scarab version", default_conf
             )
             """ Version of the scarab script"""
-            self.test_mode: bool = config.pop("test mode", default_conf["test mode"])
+            self.test_mode: bool = self._pop_or_default(
+                config, "test mode", default_conf
+            )
             """ Flag to indicate if the script is running in test mode. If True, will finish execution after processing the current batch of files."""
-            self.check_period: int = config.pop(
-                "check period in seconds", default_conf["check period in seconds"]
+            self.check_period: int = self._pop_or_default(
+                config, "check period in seconds", default_conf
             )
             """ Period to check input folders in seconds """
-            self.clean_period: pd.Timedelta = pd.Timedelta(
-                hours=config.pop(
-                    "clean period in hours", default_conf["clean period in hours"]
+            self.clean_period: datetime.timedelta = datetime.timedelta(
+                hours=self._pop_or_default(
+                    config, "clean period in hours", default_conf
                 )
             )
             """ Period to clean temp folders in hours"""
-            self.last_clean: pd.Timestamp = self._build_last_clean_time(
-                config.pop("last clean", default_conf["last clean"]),
-                config.pop("delay first clean", default_conf["delay first clean"]),
+            self.last_clean: datetime.datetime = self._build_last_clean_time(
+                self._pop_or_default(config, "last clean", default_conf),
+                self._pop_or_default(config, "delay first clean", default_conf),
             )
             """ Timestamp of the last clean operation"""
-            self.maximum_errors_before_exit: int = config.pop(
-                "maximum errors before exit", default_conf["maximum errors before exit"]
+            self.maximum_errors_before_exit: int = self._pop_or_default(
+                config, "maximum errors before exit", default_conf
             )
             """ Maximum number of errors before exiting with raised error"""
-            self.maximum_file_variations: int = config.pop(
-                "maximum file variations", default_conf["maximum file variations"]
+            self.maximum_file_variations: int = self._pop_or_default(
+                config, "maximum file variations", default_conf
             )
             """ Maximum number of file variations before exiting with raised error"""
-            self.character_scope: str = config.pop(
-                "character scope", default_conf["character scope"]
+            self.character_scope: str = self._pop_or_default(
+                config, "character scope", default_conf
             )
             """ Languages that may be used for the input data"""
             self.languages: set[str] = set(
-                config.pop("languages", default_conf["languages"])
+                self._pop_or_default(config, "languages", default_conf)
             )
 
             """ characters that will be retained from the column names. Characters not in the scope will be removed"""
             self.null_string_values: list[str] = self._ensure_list(
-                config.pop("null string values", default_conf["null string values"])
+                self._pop_or_default(config, "null string values", default_conf)
             )
             """ List of strings that will be considered as null values in the metadata file"""
-            self.default_worksheet_key: str = config.pop(
-                "default worksheet key", default_conf["default worksheet key"]
+            self.default_worksheet_key: str = self._pop_or_default(
+                config, "default worksheet key", default_conf
             )
             """Default key to be used for the worksheet that will retain single table values or non mapped values in the json root."""
-            self.default_multiple_object_key: str = config.pop(
-                "default multiple object key",
-                default_conf["default multiple object key"],
+            self.default_multiple_object_key: str = self._pop_or_default(
+                config, "default multiple object key", default_conf
             )
             """Default key to be used to designate operations that are applicable to multiple tables/worksheets."""
-            self.default_unlimited_characters_scope: str = config.pop(
-                "default unlimited characters scope",
-                default_conf["default unlimited characters scope"],
+            self.default_unlimited_characters_scope: str = self._pop_or_default(
+                config, "default unlimited characters scope", default_conf
             )
             """Default value for the unlimited characters scope. If the character scope uses this character, no restriction to the characters in the column names will be applied."""
-            self.default_worksheet_name: str = config.pop(
-                "default worksheet name", default_conf["default worksheet name"]
+            self._character_scope_sub: Callable[[str, str], str] | None = (
+                None
+                if self.character_scope == self.default_unlimited_characters_scope
+                else re.compile(self.character_scope).sub
+            )
+            """Bound sub method of the compiled character scope pattern. None if the character scope is unlimited."""
+            self.default_worksheet_name: str = self._pop_or_default(
+                config, "default worksheet name", default_conf
             )
             """Default value for the worksheet name. If value of assigned to the default key is equal to this value, will use the name of the config."""
-            self.store_data_overwrite: bool = config.pop(
-                "overwrite data in store", default_conf["overwrite data in store"]
+            self.store_data_overwrite: bool = self._pop_or_default(
+                config, "overwrite data in store", default_conf
             )
             """ Flag to indicate if data should be overwritten in store folder"""
-            self.get_data_overwrite: bool = config.pop(
-                "overwrite data in get", default_conf["overwrite data in get"]
+            self.get_data_overwrite: bool = self._pop_or_default(
+                config, "overwrite data in get", default_conf
             )
             """ Flag to indicate if data should be overwritten in get folders"""
-            self.trash_data_overwrite: bool = config.pop(
-                "overwrite data in trash", default_conf["overwrite data in trash"]
+            self.trash_data_overwrite: bool = self._pop_or_default(
+                config, "overwrite data in trash", default_conf
             )
             """ Flag to indicate if data should be overwritten in trash folder"""
-            self.discard_invalid_data_files: bool = config.pop(
-                "discard invalid data files", default_conf["discard invalid data files"]
+            self.discard_invalid_data_files: bool = self._pop_or_default(
+                config, "discard invalid data files", default_conf
             )
             """ Flag to indicate if invalid data files should be discarded"""
+            self.mirror_hard_links: bool = self._pop_or_default(
+                config, "mirror with hard links", default_conf
+            )
+            """ Flag to indicate if files missing in mirrored get folders should be hard linked instead of copied, when in the same filesystem"""
 
-            log_separator: str = config["log"].pop(
-                "separator", default_conf["log"]["separator"]
+            self._log_separator: str = self._pop_or_default(
+                config["log"], "separator", default_conf["log"]
             )
             """ Log column separator"""
-            log_format: list[str] = config["log"].pop(
-                "format", default_conf["log"]["format"]
+            self._log_format: list[str] = self._pop_or_default(
+                config["log"], "format", default_conf["log"]
             )
             """ Data columns to be presented in the log file using logging syntax"""
-            colour_sequence: list[str] = config["log"].pop(
-                "colour sequence", default_conf["log"]["colour sequence"]
+            self._colour_sequence: list[str] = self._pop_or_default(
+                config["log"], "colour sequence", default_conf["log"]
             )
             """ Colour sequence to be used in the log file using logging syntax"""
-
-            self.log_level: str = config["log"].pop(
-                "level", default_conf["log"]["level"]
+            self._log_file_format: str | None = None
+            """ Cache for log_file_format, built on first access"""
+            self._log_screen_format: str | None = None
+            """ Cache for log_screen_format, built on first access"""
+            self._log_title: str | None = None
+            """ Cache for log_title, built on first access"""
+
+            self.log_level: str = self._pop_or_default(
+                config["log"], "level", default_conf["log"]
             )
             """ Logging level"""
-            self.log_to_screen: bool = config["log"].pop(
-                "screen output", default_conf["log"]["screen output"]
+            self.log_to_screen: bool = self._pop_or_default(
+                config["log"], "screen output", default_conf["log"]
             )
             """ Flag to log to screen"""
-            self.log_to_file: bool = config["log"].pop(
-                "file output", default_conf["log"]["file output"]
+            self.log_to_file: bool = self._pop_or_default(
+                config["log"], "file output", default_conf["log"]
             )
             """ Flag to log to file"""
             self.log_file_path: list[str] = self._ensure_list(
-                config["log"].pop("file path", default_conf["log"]["file path"])
+                self._pop_or_default(config["log"], "file path", default_conf["log"])
             )
             """ Log file name with path"""
-            self.log_file_format: str = self._log_format_file(log_format, log_separator)
-            """ Data columns to be presented in the log file using logging syntax"""
-            self.log_screen_format: str = self._log_format_colour(
-                log_format, colour_sequence, log_separator
-            )
-            """ Data columns to be presented in the terminal using logging syntax, with colours"""
-            self.log_title: str = self._log_titles(log_format, log_separator)
-            """ Log header line based on the log format"""
-            self.log_overwrite: bool = config["log"].pop(
-                "overwrite log in trash", default_conf["log"]["overwrite log in trash"]
+            self.log_overwrite: bool = self._pop_or_default(
+                config["log"], "overwrite log in trash", default_conf["log"]
             )
             """ Flag to overwrite log in trash"""
 
@@ -234,7 +345,7 @@ class Config:
             )
             """ Folder used for file storage while processing is taking place. [! Mandatory]"""
             self.input_path_list: list[str] = [self.temp] + self._ensure_list(
-                config["folders"].pop("post", default_conf["folders"]["post"])
+                self._pop_or_default(config["folders"], "post", default_conf["folders"])
             )
             """ File input paths. Include all post folders and the temp folder as the first element."""
             self.trash: str = default_conf["folders"].get(
@@ -246,14 +357,14 @@ class Config:
             )
             """ Store folder path used to store processed files. [! Mandatory]"""
             self.get: dict[str, list[str]] = self._build_list_dict(
-                config["folders"].pop("get", default_conf["folders"]["get"]),
+                self._pop_or_default(config["folders"], "get", default_conf["folders"]),
                 "folders/get",
             )
             """ For each key associated with a matching pattern defined in the "data file regex", a list of target folders is defined, to which matching files should be moved."""
 
             self.catalog_files: list[str] = self._ensure_list(
-                config["files"].pop(
-                    "catalog names", default_conf["files"]["catalog names"]
+                self._pop_or_default(
+                    config["files"], "catalog names", default_conf["files"]
                 )
             )
             """ Full path to the catalog file, where metadata is stored"""
@@ -261,45 +372,45 @@ class Config:
             self.test_folders()
 
             self.metadata_file_regex: dict[str, re.Pattern] = self._build_re_dict(
-                config["files"].pop(
-                    "metadata file regex", default_conf["files"]["metadata file regex"]
+                self._pop_or_default(
+                    config["files"], "metadata file regex", default_conf["files"]
                 ),
                 "metadata file regex",
             )
             """ Regex pattern to be used to select files that may contain metadata."""
             self.data_file_regex: dict[str, re.Pattern] = self._build_re_dict(
-                config["files"].pop(
-                    "data file regex", default_conf["files"]["data file regex"]
+                self._pop_or_default(
+                    config["files"], "data file regex", default_conf["files"]
                 ),
                 "data file regex",
             )
             """ Dictionary with regex formatting to be used to select filenames to be processed as raw data files"""
             self.catalog_extension: str = os.path.splitext(self.catalog_files[0])[1]
             """ Extension used to identify the catalog files"""
-            self.input_to_ignore: list[re.Pattern[str]] = self._build_ignore_patterns(
-                self._ensure_list(
-                    config["files"].pop(
-                        "input to ignore", default_conf["files"]["input to ignore"]
+            self.input_to_ignore: tuple[re.Pattern[str], ...] = (
+                self._build_ignore_patterns(
+                    self._ensure_list(
+                        self._pop_or_default(
+                            config["files"], "input to ignore", default_conf["files"]
+                        )
                     )
                 )
             )
             """ List of compiled regex patterns for files and folders to ignore in input folders. Supports both literal strings (exact match) and regex patterns (prefix with 're:')."""
 
-            self.csv_separator: str = (
-                config["files"]
-                .pop(
-                    "metadata file formatting",
-                    default_conf["files"]["metadata file formatting"],
-                )
-                .pop(
-                    "csv separator",
-                    default_conf["files"]["metadata file formatting"]["csv separator"],
-                )
+            self.csv_separator: str = self._pop_or_default(
+                self._pop_or_default(
+                    config["files"], "metadata file formatting", default_conf["files"]
+                ),
+                "csv separator",
+                default_conf["files"]["metadata file formatting"],
             )
             """ Separator used in the metadata file if using csv format. Default to semicolon (;)."""
 
             self.table_names: dict[str, str] = self._set_default_table_name(
-                config["files"].pop("table names", default_conf["files"]["table names"])
+                self._pop_or_default(
+                    config["files"], "table names", default_conf["files"]
+                )
             )
             """ Table names to be used. {"json_root_table_name": "worksheet_name"}. Also creates the mapping {"worksheet_name": "worksheet_name"} to handle the resulting spreadsheet, when output is reloaded as input."""
             self.sheet_names: dict[str, str] = {
@@ -311,25 +422,29 @@ class Config:
             config["files"] = self._remove_empty_keys(config["files"])
 
             """ Sheet names to be used. {"worksheet_name": "json_root_table_name", ...]"""
-            self.required_tables: set[str] = set(
+            self.required_tables: frozenset[str] = frozenset(
                 self.limit_character_scope(
                     self._ensure_list(
-                        config["metadata"].pop(
+                        self._pop_or_default(
+                            config["metadata"],
                             "required tables",
-                            default_conf["metadata"]["required tables"],
+                            default_conf["metadata"],
                         )
                     )
                 )
             )
             """ Columns that define the tables required in the metadata file"""
-            self.key_columns: dict[str, set[str]] = self._build_set_dict(
-                config["metadata"].pop("key", default_conf["metadata"]["key"]), "key"
+            self.key_columns: dict[str, frozenset[str]] = self._build_set_dict(
+                self._pop_or_default(
+                    config["metadata"], "key", default_conf["metadata"]
+                ),
+                "key",
             )
             """ Columns that define the uniqueness of each row in the metadata file"""
 
             self.table_associations: dict[str, Any] = self._validate_table_associations(
-                config["metadata"].pop(
-                    "association", default_conf["metadata"]["association"]
+                self._pop_or_default(
+                    config["metadata"], "association", default_conf["metadata"]
                 )
             )
             """ Columns that define the tables associations in the metadata file with multiple tables. Example: "{<Table1>": {"PK":"<ID1>","FK": {"<Table2>": "FK2"}},<Table2>": {"PK":"<ID2>","FK": {}}}"""
@@ -339,15 +454,16 @@ class Config:
             ).difference(set(self.table_associations.keys()))
             """ Tables that are not associated with any other table."""
 
-            self.force_table_identification: bool = config["metadata"].pop(
+            self.force_table_identification: bool = self._pop_or_default(
+                config["metadata"],
                 "force table identification",
-                default_conf["metadata"]["force table identification"],
+                default_conf["metadata"],
             )
             """ Flag to enforce explicit table identification when processing metadata inputs."""
 
-            self.required_columns = self._merge_dict_set(
-                config["metadata"].pop(
-                    "in columns", default_conf["metadata"]["in columns"]
+            self.required_columns: dict[str, frozenset[str]] = self._merge_dict_set(
+                self._pop_or_default(
+                    config["metadata"], "in columns", default_conf["metadata"]
                 ),
                 self.key_columns,
                 "in columns",
@@ -355,16 +471,16 @@ class Config:
             """ Columns required in the input metadata file"""
             self.rows_sort_by: dict[str, dict[str, list]] = (
                 self._build_row_sorting_dict(
-                    config["metadata"].pop(
-                        "sort by", default_conf["metadata"]["sort by"]
+                    self._pop_or_default(
+                        config["metadata"], "sort by", default_conf["metadata"]
                     )
                 )
             )
             """ Columns that define the column by which the rows in the metadata file are sorted. Default to None, will sort by the order in which the files were posted adding a column with serial number to the data"""
             self.columns_data_filenames: dict[str, list[str]] = (
                 self.limit_character_scope(
-                    config["metadata"].pop(
-                        "data filenames", default_conf["metadata"]["data filenames"]
+                    self._pop_or_default(
+                        config["metadata"], "data filenames", default_conf["metadata"]
                     )
                 )
             )
@@ -372,15 +488,16 @@ class Config:
             self.columns_data_published: dict[str, list[str]] = (
                 self.limit_character_scope(
                     [
-                        config["metadata"].pop(
+                        self._pop_or_default(
+                            config["metadata"],
                             "data published flag",
-                            default_conf["metadata"]["data published flag"],
+                            default_conf["metadata"],
                         )
                     ]
                 )[0]
             )
             """ Columns that contain the data publication status of each row (boolean to flag if data file is present or not)"""
-            self.expected_columns_in_files: dict[str, set[str]] = (
+            self.expected_columns_in_files: dict[str, frozenset[str]] = (
                 self._get_expected_columns_in_files(
                     config["metadata"].get(
                         "add filename", default_conf["metadata"]["add filename"]
@@ -396,50 +513,70 @@ class Config:
                 )
             )
             """ Dictionary with table names (keys) and set of new columns to be created from the filename data format and add filename rules."""
-            self.add_filename: dict[str, str] = config["metadata"].pop(
-                "add filename", default_conf["metadata"]["add filename"]
+            self.add_filename: dict[str, str] = self._pop_or_default(
+                config["metadata"], "add filename", default_conf["metadata"]
             )
             """ Dictionary with table names (keys) in which a column with the defined names (values) should be created to store the source filename. Leave blank if not needed. Example: {"<table>": "<column_name>"}"""
-            self.add_timestamp: dict[str, str] = config["metadata"].pop(
-                "add file timestamp",
-                default_conf["metadata"]["add file timestamp"],
+            self.add_timestamp: dict[str, str] = self._pop_or_default(
+                config["metadata"], "add file timestamp", default_conf["metadata"]
             )
             """ Dictionary with table names (keys) in which a column with the defined names (values) should be created to store the timestamp of the source file. Leave blank if not needed. Example: {"<table>": "<column_name>"}"""
             self.filename_data_format: dict[str, re.Pattern] = self._build_re_dict(
-                config["metadata"].pop(
-                    "filename data format",
-                    default_conf["metadata"]["filename data format"],
+                self._pop_or_default(
+                    config["metadata"], "filename data format", default_conf["metadata"]
                 ),
                 "filename data format",
             )
             """ Dictionary with table names (keys) and regex patterns (values) to extract data from the filename. Use re.match.groupdict() syntax."""
-            self.filename_data_processing_rules: dict[str, dict[str, Any]] = config[
-                "metadata"
-            ].pop(
-                "filename data processing rules",
-                default_conf["metadata"]["filename data processing rules"],
+            self.filename_data_processing_rules: dict[str, dict[str, Any]] = (
+                self._pop_or_default(
+                    config["metadata"],
+                    "filename data processing rules",
+                    default_conf["metadata"],
+                )
             )
             """ Dictionary with old and new characters to be replaced in the data extracted from the filename, defined for each key in the replacement pattern."""
 
             # Pop empty objects within the config in the dict
             config = self._remove_empty_keys(config)
             if config:
-                print(
-                    f"\n\nError: Configuration file contains unknown keys: {json.dumps(config)}"
+                _exit_with_error(
+                    f"Error: Configuration file contains unknown keys: {json.dumps(config)}"
                 )
-                exit(1)
 
             self._test_get_regex()
 
         except KeyError as e:
-            print(f"\n\nError: Configuration files missing arguments: {e}")
-            exit(1)
+            _exit_with_error(f"Error: Configuration files missing arguments: {e}")
         except ValueError as e:
-            print(f"\n\nError: Configuration files invalid arguments: {e}")
-            exit(1)
+            _exit_with_error(f"Error: Configuration files invalid arguments: {e}")
         except Exception as e:
-            print(f"\n\nError: Unknown error occurred when loading '{filename}': {e}")
-            exit(1)
+            _exit_with_error(
+                f"Error: Unknown error occurred when loading '{filename}': {e}"
+            )
+
+    # --------------------------------------------------------------
+    def _pop_or_default(
+        self, section: dict[str, Any], key: str, default_section: dict[str, Any]
+    ) -> Any:
+        """Pop a key from a config section, reading the default value only if the key is missing.
+
+        Args:
+            section (dict[str, Any]): Section of the loaded configuration.
+            key (str): Key to pop.
+            default_section (dict[str, Any]): Matching section of the default configuration.
+
+        Returns:
+            Any: Value from the configuration, or the default value if the key is missing.
+
+        Raises:
+            KeyError: If the key is missing from both sections.
+        """
+
+        if key in section:
+            return section.pop(key)
+
+        return default_section[key]
 
     # --------------------------------------------------------------
     def _ensure_list(self, item: Any) -> list[str]:
@@ -459,13 +596,12 @@ class Config:
         elif isinstance(item, list):
             return item
         else:
-            print(
-                f"\n\nError: Invalid type for item: {type(item)}. Expected a string or a list."
+            _exit_with_error(
+                f"Error: Invalid type for item: {type(item)}. Expected a string or a list."
             )
-            exit(1)
 
     # --------------------------------------------------------------
-    def _build_ignore_patterns(self, values: list[str]) -> list[re.Pattern[str]]:
+    def _build_ignore_patterns(self, values: list[str]) -> tuple[re.Pattern[str], ...]:
         """Build regex patterns for input_to_ignore, supporting both literal strings and regex patterns.
 
         - Strings prefixed with 're:' are treated as raw regex patterns
@@ -475,7 +611,7 @@ class Config:
             values (list[str]): List of ignore patterns from config
 
         Returns:
-            list[re.Pattern[str]]: Compiled regex patterns
+            tuple[re.Pattern[str], ...]: Compiled regex patterns
         """
 
         patterns = []
@@ -485,17 +621,16 @@ class Config:
                 try:
                     patterns.append(re.compile(value[3:]))
                 except re.error as e:
-                    print(
-                        f"\n\nError: Invalid regex pattern in 'input to ignore': {value[3:]} - {e}"
+                    _exit_with_error(
+                        f"Error: Invalid regex pattern in 'input to ignore': {value[3:]} - {e}"
                     )
-                    exit(1)
             else:
                 # Literal mode: match basename or full relative path
                 # Use os.path.basename to extract just the filename/folder name
                 escaped = re.escape(os.path.basename(value))
                 patterns.append(re.compile(rf"^{escaped}$"))
 
-        return patterns
+        return tuple(patterns)
 
     # --------------------------------------------------------------
     def _ensure_mandatory_structure(self, config: dict) -> dict[str, Any]:
@@ -522,7 +657,7 @@ class Config:
         add_filename: dict[str, str],
         add_timestamp: dict[str, str],
         filename_data_format: dict[str, str],
-    ) -> dict[str, set[str]]:
+    ) -> dict[str, frozenset[str]]:
         """Get expected columns in files based on add_filename, add_timestamp, and filename_data_format.
 
         Args:
@@ -531,7 +666,7 @@ class Config:
             filename_data_format (dict[str,str]): Dictionary with table names (keys) and regex patterns (values) to extract data from filenames.
 
         Returns:
-            dict[str, set[str]]: Dictionary with table names (keys) and sets of expected columns (values).
+            dict[str, frozenset[str]]: Dictionary with table names (keys) and sets of expected columns (values).
         """
 
         # Start with columns from add_filename and add_timestamp values
@@ -554,62 +689,61 @@ class Config:
             self.key_columns.keys()
         )
 
-        expected_columns: dict[str, set[str]] = {table: set() for table in all_tables}
-        for table in all_tables:
-            expected_columns[table] = (
-                self.required_columns.get(table, set())
-                .union(self.key_columns.get(table, set()))
-                .difference(new_columns.get(table, set()))
-            )
+        expected_columns: dict[str, frozenset[str]] = {
+            table: (
+                self.required_columns.get(table, frozenset())
+                | self.key_columns.get(table, frozenset())
+            ).difference(new_columns.get(table, set()))
+            for table in all_tables
+        }
 
         return expected_columns
 
     # --------------------------------------------------------------
     def _merge_dict_set(
-        self, new_data: dict[str, Any], existing_set: dict[str, set[str]], name: str
-    ) -> dict[str, set[str]]:
+        self,
+        new_data: dict[str, Any],
+        existing_set: dict[str, frozenset[str]],
+        name: str,
+    ) -> dict[str, frozenset[str]]:
         """Merge a dictionary of sets with the key columns to create a unified dictionary of required columns.
 
         Args:
             new_data (dict[str, Any]): Dictionary with table names as keys and sets of required columns as values.
-            existing_set (dict[str, set[str]]): Existing dictionary with table names as keys and sets of required columns as values.
+            existing_set (dict[str, frozenset[str]]): Existing dictionary with table names as keys and sets of required columns as values.
             name (str): Name of the configuration section for logging purposes.
 
         Returns:
-            dict[str, set[str]]: Merged dictionary with table names as keys and sets of required columns as values.
+            dict[str, frozenset[str]]: Merged dictionary with table names as keys and sets of required columns as values.
         """
 
         data = self._build_set_dict(new_data, name)
 
-        self.key_columns  # Already built above
-
-        merged_dict: dict[str, set[str]] = {}
-        all_keys = set(data.keys()) | set(existing_set.keys())
-        for k in all_keys:
-            merged_dict[k] = data.get(k, set()).union(existing_set.get(k, set()))
-
-        return merged_dict
+        return {
+            k: data.get(k, frozenset()) | existing_set.get(k, frozenset())
+            for k in data.keys() | existing_set.keys()
+        }
 
     # --------------------------------------------------------------
     def _build_last_clean_time(
         self, last_clean: str, delay_clean: bool
-    ) -> pd.Timestamp:
+    ) -> datetime.datetime:
         """Build the last clean time from the configuration value.
 
         Args:
             last_clean (Any): Last clean time from the configuration file.
 
         Returns:
-            pd.Timestamp: Last clean time as a pandas Timestamp.
+            datetime.datetime: Last clean time as a naive local time.
 
         Raises:
             ValueError: If the last clean time is not in a valid format.
         """
 
         try:
-            timestamp = pd.to_datetime(last_clean, format="%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            timestamp = pd.Timestamp.now()
+            timestamp = datetime.datetime.strptime(last_clean, "%Y-%m-%d %H:%M:%S")
+        except (ValueError, TypeError):
+            timestamp = datetime.datetime.now()
             if last_clean != "none":
                 print(
                     f"\n\nError: Invalid 'last clean' time format: {last_clean}. Expected format: YYYY-MM-DD HH:MM:SS"
@@ -662,125 +796,139 @@ class Config:
 
         for table, assoc in associations.items():
             if assoc.get(PK_KEY, False):
-                if isinstance(assoc[PK_KEY], dict):
-                    # test if assoc[PK_KEY] is an instance of the class PKInfoBase
-                    if not fk_required_keys.issubset(set(assoc[PK_KEY].keys())):
-                        print(
-                            f"\n\nError in config file. Invalid primary key structure in table {table}: Used {assoc[PK_KEY]}, expected a dictionary with keys: {fk_required_keys}."
-                        )
-                        exit(1)
-                else:
-                    print(
-                        f"\n\nError in config file. Invalid primary key data type in table {table}: Used {assoc[PK_KEY]}, expected a dictionary."
+                if not isinstance(assoc[PK_KEY], dict):
+                    _exit_with_error(
+                        f"Error in config file. Invalid primary key data type in table {table}: Used {assoc[PK_KEY]}, expected a dictionary."
+                    )
+                # test if assoc[PK_KEY] is an instance of the class PKInfoBase
+                if not fk_required_keys.issubset(assoc[PK_KEY].keys()):
+                    _exit_with_error(
+                        f"Error in config file. Invalid primary key structure in table {table}: Used {assoc[PK_KEY]}, expected a dictionary with keys: {fk_required_keys}."
                     )
-                    exit(1)
 
-                pk_column = assoc[PK_KEY].get(NAME_KEY, False)
-                if not pk_column or not isinstance(pk_column, str):
-                    print(
-                        f"\n\nError in config file. Invalid primary key name in table {table}: Used {pk_column}, expected a string."
+                # check all PK values against the schema types in a single pass
+                invalid_key = next(
+                    (
+                        key
+                        for key, key_type in PK_BASE_SCHEMA.items()
+                        if not isinstance(assoc[PK_KEY][key], key_type)
+                    ),
+                    None,
+                )
+                if invalid_key:
+                    _exit_with_error(
+                        f"Error in config file. Invalid primary key '{invalid_key}' in table {table}: Used {assoc[PK_KEY][invalid_key]}, expected a {PK_BASE_SCHEMA[invalid_key].__name__}."
                     )
-                    exit(1)
 
-                relative_value = assoc[PK_KEY].get(RELATIVE_VALUE_KEY, False)
-                if not isinstance(relative_value, bool):
-                    print(
-                        f"\n\nError in config file. Invalid primary key relative value in table {table}: Used {relative_value}, expected a boolean."
+                pk_column = assoc[PK_KEY][NAME_KEY]
+                if not pk_column:
+                    _exit_with_error(
+                        f"Error in config file. Invalid primary key name in table {table}: Used {pk_column}, expected a non-empty string."
                     )
-                    exit(1)
-                elif relative_value:
+
+                relative_value = assoc[PK_KEY][RELATIVE_VALUE_KEY]
+                if relative_value:
                     absolute_pk_in_use = False
-                else:
-                    if not absolute_pk_in_use:
-                        print(
-                            f"\n\nError in config file. Inconsistent primary key types: Table {table} uses relative primary keys while another table uses absolute primary keys. All tables must use the same type."
-                        )
-                        exit(1)
+                elif not absolute_pk_in_use:
+                    _exit_with_error(
+                        f"Error in config file. Inconsistent primary key types: Table {table} uses relative primary keys while another table uses absolute primary keys. All tables must use the same type."
+                    )
 
                 # Validate and default delete orphan setting
                 delete_orphan = assoc[PK_KEY].get(DELETE_ORPHAN_KEY, False)
                 if not isinstance(delete_orphan, bool):
-                    print(
-                        f"\n\nError in config file. Invalid delete orphan value in table {table}: Used {delete_orphan}, expected a boolean."
+                    _exit_with_error(
+                        f"Error in config file. Invalid delete orphan value in table {table}: Used {delete_orphan}, expected a boolean."
                     )
-                    exit(1)
                 assoc[PK_KEY][DELETE_ORPHAN_KEY] = delete_orphan
 
-                if pk_column in self.key_columns.get(table, set()) and relative_value:
-                    self.key_columns[table].remove(pk_column)
+                if (
+                    pk_column in self.key_columns.get(table, frozenset())
+                    and relative_value
+                ):
+                    self.key_columns[table] = self.key_columns[table] - {pk_column}
 
             if assoc.get(FK_KEY, False):
                 if not isinstance(assoc[FK_KEY], dict):
-                    print(
-                        f"\n\nError in config file. Invalid foreign key structure in table {table}: Used {assoc[FK_KEY]}, expected a dictionary."
+                    _exit_with_error(
+                        f"Error in config file. Invalid foreign key structure in table {table}: Used {assoc[FK_KEY]}, expected a dictionary."
                     )
-                    exit(1)
-                elif assoc[FK_KEY] == {}:
-                    print(
-                        f"\n\nError in config file. Foreign key structure in table {table} is empty: Used {assoc[FK_KEY]}, expected a dictionary."
+
+                assoc[FK_KEY] = {
+                    fk_table: self._normalize_foreign_key(
+                        table, fk_table, fk_value, associations
                     )
-                    exit(1)
+                    for fk_table, fk_value in assoc[FK_KEY].items()
+                }
 
-                normalized_fk: dict[str, dict[str, Any]] = {}
+        # Create REFERENCED_BY_KEY key in every primary key info once, so tables with no references get an empty set
+        for assoc in associations.values():
+            if assoc.get(PK_KEY, False):
+                assoc[PK_KEY].setdefault(REFERENCED_BY_KEY, set())
 
-                for fk_table, fk_value in assoc[FK_KEY].items():
-                    if not isinstance(fk_table, str):
-                        print(
-                            f"\n\nError in config file. Invalid foreign key table name in table {table}: Used {fk_table}, expected a string."
-                        )
-                        exit(1)
-
-                    fk_column: str | None = None
-                    fk_delete_orphan: bool = False
-
-                    if isinstance(fk_value, str):
-                        # Backwards compatibility: if the value is a string, treat it as the column name and set delete orphan to False
-                        fk_column = fk_value
-                    elif isinstance(fk_value, dict):
-                        fk_column = fk_value.get(NAME_KEY, None)
-                        if not isinstance(fk_column, str):
-                            print(
-                                f"\n\nError in config file. Invalid foreign key name in table {table} for reference {fk_table}: Used {fk_column}, expected a string."
-                            )
-                            exit(1)
-
-                        fk_delete_orphan = fk_value.get(DELETE_ORPHAN_KEY, False)
-                        if not isinstance(fk_delete_orphan, bool):
-                            print(
-                                f"\n\nError in config file. Invalid delete orphan value in FK {table}->{fk_table}: Used {fk_delete_orphan}, expected a boolean."
-                            )
-                            exit(1)
-                    else:
-                        print(
-                            f"\n\nError in config file. Invalid foreign key structure in table {table}: Used {fk_table}:{fk_value}, expected a string or a dictionary with keys '{NAME_KEY}' and optional '{DELETE_ORPHAN_KEY}'."
-                        )
-                        exit(1)
+        # Add the table back reference along with the primary key info
+        for table, assoc in associations.items():
+            for fk_table in assoc.get(FK_KEY) or {}:
+                associations[fk_table][PK_KEY][REFERENCED_BY_KEY].add(table)
 
-                    if not fk_column:
-                        print(
-                            f"\n\nError in config file. Invalid foreign key name in table {table} for reference {fk_table}: Used {fk_column}, expected a non-empty string."
-                        )
-                        exit(1)
+        return associations
 
-                    # test if fk_table is defined in the associations
-                    if fk_table not in associations:
-                        print(
-                            f"\n\nError in config file. Foreign key table {fk_table} in table {table} points to non defined table."
-                        )
-                        exit(1)
+    # --------------------------------------------------------------
+    def _normalize_foreign_key(
+        self, table: str, fk_table: str, fk_value: Any, associations: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Validate a single foreign key definition and return it in the normalized format.
 
-                    normalized_fk[fk_table] = {
-                        NAME_KEY: fk_column,
-                        DELETE_ORPHAN_KEY: fk_delete_orphan,
-                    }
+        Args:
+            table (str): Table that holds the foreign key.
+            fk_table (str): Table referenced by the foreign key.
+            fk_value (Any): Foreign key definition. Either the column name or a dictionary with name and delete orphan keys.
+            associations (dict[str, Any]): Table associations, used to check that the referenced table is defined.
 
-                    # Create REFERENCED_BY_KEY key with the table back reference along with the primary key info
-                    associations[fk_table][PK_KEY].setdefault(REFERENCED_BY_KEY, set())
-                    associations[fk_table][PK_KEY][REFERENCED_BY_KEY].add(table)
+        Returns:
+            dict[str, Any]: Dictionary with the FK column name and the delete orphan flag.
 
-                assoc[FK_KEY] = normalized_fk
+        Raises: None
+        """
 
-        return associations
+        if not isinstance(fk_table, str):
+            _exit_with_error(
+                f"Error in config file. Invalid foreign key table name in table {table}: Used {fk_table}, expected a string."
+            )
+
+        if isinstance(fk_value, str):
+            # Backwards compatibility: if the value is a string, treat it as the column name and set delete orphan to False
+            fk_column = fk_value
+            fk_delete_orphan = False
+        elif isinstance(fk_value, dict):
+            fk_column = fk_value.get(NAME_KEY, None)
+            if not isinstance(fk_column, str):
+                _exit_with_error(
+                    f"Error in config file. Invalid foreign key name in table {table} for reference {fk_table}: Used {fk_column}, expected a string."
+                )
+
+            fk_delete_orphan = fk_value.get(DELETE_ORPHAN_KEY, False)
+            if not isinstance(fk_delete_orphan, bool):
+                _exit_with_error(
+                    f"Error in config file. Invalid delete orphan value in FK {table}->{fk_table}: Used {fk_delete_orphan}, expected a boolean."
+                )
+        else:
+            _exit_with_error(
+                f"Error in config file. Invalid foreign key structure in table {table}: Used {fk_table}:{fk_value}, expected a string or a dictionary with keys '{NAME_KEY}' and optional '{DELETE_ORPHAN_KEY}'."
+            )
+
+        if not fk_column:
+            _exit_with_error(
+                f"Error in config file. Invalid foreign key name in table {table} for reference {fk_table}: Used {fk_column}, expected a non-empty string."
+            )
+
+        # test if fk_table is defined in the associations
+        if fk_table not in associations:
+            _exit_with_error(
+                f"Error in config file. Foreign key table {fk_table} in table {table} points to non defined table."
+            )
+
+        return {NAME_KEY: fk_column, DELETE_ORPHAN_KEY: fk_delete_orphan}
 
     # --------------------------------------------------------------
     def _test_get_regex(self) -> None:
@@ -843,14 +991,42 @@ class Config:
             with open(filename, "r", encoding="utf-8") as json_file:
                 return json.load(json_file)
             # If we reach this point, the file was empty or not valid JSON
-            print(f"\n\nError: Config file is empty or invalid JSON: {filename}")
-            exit(1)
+            _exit_with_error(f"Error: Config file is empty or invalid JSON: {filename}")
         except FileNotFoundError:
-            print(f"\n\nError: Config file not found in path: {filename}")
-            exit(1)
+            _exit_with_error(f"Error: Config file not found in path: {filename}")
         except Exception as e:
-            print(f"\n\nError: When attempting to read file: {e}")
-            exit(1)
+            _exit_with_error(f"Error: When attempting to read file: {e}")
+
+    # --------------------------------------------------------------
+    @property
+    def log_file_format(self) -> str:
+        """Data columns to be presented in the log file using logging syntax. Built on first access."""
+
+        if self._log_file_format is None:
+            self._log_file_format = self._log_format_file(
+                self._log_format, self._log_separator
+            )
+        return self._log_file_format
+
+    # --------------------------------------------------------------
+    @property
+    def log_screen_format(self) -> str:
+        """Data columns to be presented in the terminal using logging syntax, with colours. Built on first access."""
+
+        if self._log_screen_format is None:
+            self._log_screen_format = self._log_format_colour(
+                self._log_format, self._colour_sequence, self._log_separator
+            )
+        return self._log_screen_format
+
+    # --------------------------------------------------------------
+    @property
+    def log_title(self) -> str:
+        """Log header line based on the log format. Built on first access."""
+
+        if self._log_title is None:
+            self._log_title = self._log_titles(self._log_format, self._log_separator)
+        return self._log_title
 
     # --------------------------------------------------------------
     def _log_format_colour(
@@ -869,17 +1045,16 @@ class Config:
         Raises: None
         """
 
-        output_format = ""
-        colour_count = 0
         colour_set = "\x1b["
-        separator = f"{colour_set}0m{log_separator}"
-        for item in log_format:
-            output_format = f"{output_format}{colour_set}{colour_format[colour_count]}{item}{separator}"
-            colour_count += 1
-            if colour_count == len(colour_format):
-                colour_count = 0
+        colour_reset = f"{colour_set}0m"
 
-        return output_format[: -len(log_separator)]
+        # colours are reused cyclically if there are more items than colours
+        coloured_items = (
+            f"{colour_set}{colour}{item}"
+            for item, colour in zip(log_format, itertools.cycle(colour_format))
+        )
+
+        return f"{colour_reset}{log_separator}".join(coloured_items) + colour_reset
 
     # --------------------------------------------------------------
     def _log_format_file(self, format_string: list[str], log_separator: str) -> str:
@@ -895,11 +1070,7 @@ class Config:
         Raises: None
         """
 
-        output_format = ""
-        for item in format_string:
-            output_format = f"{output_format}{item}{log_separator}"
-
-        return output_format[: -len(log_separator)]
+        return log_separator.join(format_string)
 
     # --------------------------------------------------------------
     def _log_titles(self, log_format: list[str], log_separator: str) -> str:
@@ -920,19 +1091,42 @@ class Config:
         Raises: None
         """
 
-        non_title = ["%(", ")s", ")d"]
-        output_format = ""
-        for item in log_format:
-            for non in non_title:
-                item = item.replace(non, "")
+        strip = LOG_TITLE_STRIP.sub
+
+        return log_separator.join(strip("", item) for item in log_format)
+
+    # --------------------------------------------------------------
+    def _validate_dict_section(
+        self, data: Any, name: str, value_types: tuple[type, ...]
+    ) -> None:
+        """Validate in a single pass that a config section is a dictionary with values of the expected types.
+
+        Args:
+            data (Any): Input data from serialized json file.
+            name (str): Name of the config section, used for error messages.
+            value_types (tuple[type, ...]): Types accepted for the dictionary values.
+
+        Returns: None
 
-            output_format = f"{output_format}{item}{log_separator}"
+        Raises:
+            SystemExit: If the section or any of its values has an invalid type. The path to the first invalid value is reported.
+        """
 
-        return output_format[: -len(log_separator)]
+        if not isinstance(data, dict):
+            _exit_with_error(
+                f"Error: Invalid data: '{type(data)}'. Expected a dictionary in config '{name}'."
+            )
+
+        for key, value in data.items():
+            if not isinstance(value, value_types):
+                expected = " or ".join(t.__name__ for t in value_types)
+                _exit_with_error(
+                    f"Error: Invalid data: '{type(value)}' in config '{name}/{key}'. Expected {expected}."
+                )
 
     # --------------------------------------------------------------
     def _build_list_dict(self, data: dict[str, Any], name: str) -> dict[str, list[str]]:
-        """Validate serialized input and build a dictionary with set values
+        """Validate serialized input and build a dictionary with list values
 
         Args:
             data (dict[str, Any]): Input data from serialized json file.
@@ -942,17 +1136,14 @@ class Config:
             dict[str, list[str]]: Dictionary with table names as keys and list of strings as values.
         """
 
-        # test if data is of dict type, if not, raise an error
-        if not isinstance(data, dict):
-            print(
-                f"\n\nError: Invalid data '{type(data)}'. Expected a dictionary in config {name} for list creation."
-            )
-            exit(1)
+        self._validate_dict_section(data, name, (str, list))
 
-        return {k: self._ensure_list(v) for k, v in data.items()}
+        return {k: [v] if isinstance(v, str) else v for k, v in data.items()}
 
     # --------------------------------------------------------------
-    def _build_set_dict(self, data: dict[str, Any], name: str) -> dict[str, set[str]]:
+    def _build_set_dict(
+        self, data: dict[str, Any], name: str
+    ) -> dict[str, frozenset[str]]:
         """Validate serialized input and build a dictionary with set values
 
         Args:
@@ -960,38 +1151,33 @@ class Config:
             name (str): Name of the data type being processed, used for error messages.
 
         Returns:
-            dict[str, set[str]]: Dictionary with table names as keys and sets of strings as values.
+            dict[str, frozenset[str]]: Dictionary with table names as keys and sets of strings as values.
         """
 
-        # test if data is of dict type, if not, raise an error
-        if not isinstance(data, dict):
-            print(
-                f"\n\nError: Invalid data: '{type(data)}'. Expected a dictionary in config {name} for set creation."
-            )
-            exit(1)
+        self._validate_dict_section(data, name, (str, list))
 
-        # Use a dictionary comprehension to convert each list to a set directly
-        return {k: set(self._ensure_list(v)) for k, v in data.items()}
+        return {k: frozenset([v] if isinstance(v, str) else v) for k, v in data.items()}
 
     # --------------------------------------------------------------
     def _build_re_dict(self, data: dict[str, str], name) -> dict[str, re.Pattern]:
-        """Build a dictionary with regex patterns for extracting data from filenames.
+        """Validate serialized input and build a dictionary with compiled regex patterns.
 
         Args:
             data (dict[str, str]): Input data with table names as keys and regex patterns as values.
+            name (str): Name of the data type being processed, used for error messages.
 
         Returns:
             dict[str, re.Pattern]: Dictionary with table names as keys and compiled regex patterns as values.
         """
 
-        # test if data is of dict type, if not, raise an error
-        if not isinstance(data, dict):
-            print(
-                f"\n\nError: Invalid type for filename data format: {type(data)} in config '{name}'. Expected a dictionary."
-            )
-            exit(1)
+        self._validate_dict_section(data, name, (str,))
 
-        return {k: re.compile(v) for k, v in data.items()}
+        try:
+            return {k: _compile_pattern(v) for k, v in data.items()}
+        except re.error as e:
+            _exit_with_error(
+                f"Error: Invalid regex pattern '{e.pattern}' in config '{name}': {e}"
+            )
 
     # --------------------------------------------------------------
     def _build_row_sorting_dict(
@@ -1008,75 +1194,93 @@ class Config:
 
         # test if data is of dict type, if not, raise an error
         if not isinstance(data, dict):
-            print(
-                f"\n\nError: Invalid type for row sorting: {type(data)}. Expected a dictionary."
+            _exit_with_error(
+                f"Error: Invalid type for row sorting: {type(data)}. Expected a dictionary."
             )
-            exit(1)
 
         for key in self.key_columns.keys():
             if key not in data:
                 data[key] = {}
-            elif isinstance(data[key], dict):
-                if SORT_BY_KEY in data[key]:
-                    data[key][SORT_BY_KEY] = self._ensure_list(
-                        self.limit_character_scope(data[key][SORT_BY_KEY])
-                    )
-                else:
-                    print(
-                        f"\n\nError: Invalid row sorting value for table '{key}': {data[key]}. Expected a dict with '{SORT_BY_KEY}' key."
-                    )
-                    exit(1)
-                if ASCENDING_SORT_KEY in data[key]:
-                    if isinstance(data[key][ASCENDING_SORT_KEY], list):
-                        if not all(
-                            isinstance(x, bool) for x in data[key][ASCENDING_SORT_KEY]
-                        ):
-                            print(
-                                f"\n\nError: Invalid ascending sort value for table '{key}': {data[key][ASCENDING_SORT_KEY]}. Expected a list of boolean."
-                            )
-                            exit(1)
-                        if len(data[key][ASCENDING_SORT_KEY]) != len(
-                            data[key][SORT_BY_KEY]
-                        ):
-                            print(
-                                f"\n\nError: Invalid ascending sort value for table '{key}': {data[key][ASCENDING_SORT_KEY]}. Expected a list of boolean with the same length as the sort by list."
-                            )
-                            exit(1)
-                    elif not isinstance(data[key][ASCENDING_SORT_KEY], bool):
-                        print(
-                            f"\n\nError: Invalid ascending sort value for table '{key}': {data[key][ASCENDING_SORT_KEY]}. Expected a boolean or list of booleans."
-                        )
-                        exit(1)
-                else:
-                    print(
-                        f"\n\nError: Invalid row sorting value for table '{key}': {data[key]}. Expected a dict with '{ASCENDING_SORT_KEY}' key."
-                    )
-                    exit(1)
             else:
-                print(
-                    f"\n\nError: Invalid row sorting value for table '{key}': {data[key]}. Expected a dict. For default post order ordering, remove key."
-                )
-                exit(1)
+                self._validate_sort_entry(key, data[key])
 
         return data
 
     # --------------------------------------------------------------
-    def _str_clean_recursive(self, data: Any) -> Any:
-        """Recursively clean strings in a nested structure by removing characters not in the character_scope.
+    def _validate_sort_entry(self, key: str, entry: Any) -> None:
+        """Validate the row sorting definition of a table, normalizing the sort by columns to a list in place.
+
+        Args:
+            key (str): Table name, used for error messages.
+            entry (Any): Row sorting definition for the table.
+
+        Returns: None
+
+        Raises:
+            SystemExit: If the row sorting definition is invalid.
+        """
+
+        if not isinstance(entry, dict):
+            _exit_with_error(
+                f"Error: Invalid row sorting value for table '{key}': {entry}. Expected a dict. For default post order ordering, remove key."
+            )
+
+        sort_by = entry.get(SORT_BY_KEY)
+        if sort_by is None:
+            _exit_with_error(
+                f"Error: Invalid row sorting value for table '{key}': {entry}. Expected a dict with '{SORT_BY_KEY}' key."
+            )
+        entry[SORT_BY_KEY] = sort_by = self._ensure_list(
+            self.limit_character_scope(sort_by)
+        )
+
+        ascending = entry.get(ASCENDING_SORT_KEY)
+        if ascending is None:
+            _exit_with_error(
+                f"Error: Invalid row sorting value for table '{key}': {entry}. Expected a dict with '{ASCENDING_SORT_KEY}' key."
+            )
+
+        if isinstance(ascending, list):
+            if not all(type(x) is bool for x in ascending):
+                _exit_with_error(
+                    f"Error: Invalid ascending sort value for table '{key}': {ascending}. Expected a list of boolean."
+                )
+            if len(ascending) != len(sort_by):
+                _exit_with_error(
+                    f"Error: Invalid ascending sort value for table '{key}': {ascending}. Expected a list of boolean with the same length as the sort by list."
+                )
+        elif type(ascending) is not bool:
+            _exit_with_error(
+                f"Error: Invalid ascending sort value for table '{key}': {ascending}. Expected a boolean or list of booleans."
+            )
+
+    # --------------------------------------------------------------
+    def _str_clean_nested(self, data: Any) -> Any:
+        """Clean strings in a nested structure by removing characters not in the character_scope.
+        Lists and dictionaries are walked with an explicit stack and updated in place.
+
         Args:
             data (Any): Input data which can be a string, list, or dictionary.
         Returns:
             Any: Cleaned data with only characters in the character_scope kept.
         """
 
-        if isinstance(data, str):
-            return re.sub(self.character_scope, "", data)
-        elif isinstance(data, list):
-            return [self._str_clean_recursive(item) for item in data]
-        elif isinstance(data, dict):
-            return {k: self._str_clean_recursive(v) for k, v in data.items()}
-        else:
-            return data
+        scope_sub = self._character_scope_sub
+
+        # hold the root in a list so that a top level string can also be replaced in place
+        root = [data]
+        stack: list[tuple[Any, Any]] = [(root, 0)]
+        while stack:
+            container, key = stack.pop()
+            item = container[key]
+            if isinstance(item, str):
+                container[key] = scope_sub("", item)  # type: ignore
+            elif isinstance(item, list):
+                stack.extend((item, index) for index in range(len(item)))
+            elif isinstance(item, dict):
+                stack.extend((item, k) for k in item)
+
+        return root[0]
 
     # --------------------------------------------------------------
     def limit_character_scope(self, data: Any) -> Any:
@@ -1089,10 +1293,10 @@ class Config:
         Returns:
             list[str] | dict: Output with only characters in the character_scope kept.
         """
-        if self.character_scope == self.default_unlimited_characters_scope:
+        if self._character_scope_sub is None:
             return data
 
-        return self._str_clean_recursive(data)
+        return self._str_clean_nested(data)
 
     # --------------------------------------------------------------
     def set_last_clean(self) -> None:
@@ -1108,19 +1312,26 @@ class Config:
             Exception: Config file write error.
         """
 
-        self.last_clean = pd.to_datetime("now")
+        self.last_clean = datetime.datetime.now()
 
-        self.raw["last clean"] = self.last_clean.strftime("%Y-%m-%d %H:%M:%S")
+        last_clean = self.last_clean.strftime("%Y-%m-%d %H:%M:%S")
+        if self.raw.get("last clean") == last_clean:
+            return
 
+        self.raw["last clean"] = last_clean
+
+        # write to a temporary file and replace the config file, so a failed write never leaves a truncated config
+        temp_file = f"{self.config_file}.tmp"
         try:
-            with open(self.config_file, "w", encoding="utf-8") as json_file:
+            with open(temp_file, "w", encoding="utf-8") as json_file:
                 json.dump(self.raw, json_file, indent=4)
+            os.replace(temp_file, self.config_file)
         except Exception as e:
             raise Exception(f"File write error: {e}")
 
     # --------------------------------------------------------------
     def _test_folder(
-        self, folder: str, folder_type: str, message: str
+        self, folder: str, folder_type: str, message: str, existing: set[str]
     ) -> tuple[bool, str]:
         """Test if the folder exists and add an error message if it does not.
 
@@ -1128,17 +1339,55 @@ class Config:
             folder (str): folder path to be tested.
             folder_type (str): folder type to be mentioned in the error message.
             msg (str): error message to be updated.
+            existing (set[str]): normalized paths found by _list_existing_paths.
 
         Returns:
             msg: error message with the folder test result.
         """
         test_result = True
-        if not os.path.exists(folder):
+        if os.path.normcase(os.path.normpath(folder)) not in existing:
             message += f"\n  - {folder_type} folder not found: {folder}"
             test_result = False
 
         return test_result, message
 
+    # --------------------------------------------------------------
+    def _list_existing_paths(self, paths: list[str]) -> set[str]:
+        """Find which paths exist, reading each parent folder only once.
+
+        Args:
+            paths (list[str]): paths to be tested.
+
+        Returns:
+            set[str]: normalized paths that exist, with case normalized as the operating system does.
+        """
+
+        existing = set()
+        by_parent: dict[str, set[str]] = {}
+        for path in paths:
+            path = os.path.normcase(os.path.normpath(path))
+            # drive and share roots have no name to be found in a parent listing
+            if not os.path.basename(path):
+                if os.path.exists(path):
+                    existing.add(path)
+                continue
+            by_parent.setdefault(os.path.dirname(path), set()).add(path)
+
+        for parent, children in by_parent.items():
+            try:
+                with os.scandir(parent or ".") as entries:
+                    names = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                # listing may be denied where traversing is allowed
+                existing.update(child for child in children if os.path.exists(child))
+                continue
+
+            existing.update(
+                child for child in children if os.path.basename(child) in names
+            )
+
+        return existing
+
     # --------------------------------------------------------------
     def _test_file(
         self, filename: str, file_type: str, message: str, required: bool = False
@@ -1155,28 +1404,25 @@ class Config:
             msg: error message with the file test result.
         """
 
-        try:
-            test_result = True
-
-            with open(filename, "a") as file:
-                # use tell() to check if the file at the beginning, thus, has been just created by the file open function call
-                file_is_empty = file.tell() == 0
-                if not file.writable():
-                    raise Exception(f"{filename} not writable")
-
-            if file_is_empty:
-                if required:
-                    message += f"\n  - {file_type} file is empty: {filename}"
-                    test_result = False
-
-                os.remove(filename)
+        test_result = True
 
-        except (FileNotFoundError, OSError) as e:
+        # use stat and access to test the file without creating, opening or removing it
+        try:
+            file_is_empty = os.stat(filename).st_size == 0
+            writable = os.access(filename, os.W_OK)
+        except FileNotFoundError:
+            file_is_empty = True
+            writable = os.access(os.path.dirname(filename) or ".", os.W_OK)
+        except OSError as e:
             message += f"\n  - {file_type} file [{filename}] not available {e}"
+            return False, message
+
+        if not writable:
+            message += f"\n  - {file_type} error. {filename} not writable"
             test_result = False
 
-        except Exception as e:
-            message += f"\n  - {file_type} error. {e}"
+        if file_is_empty and required:
+            message += f"\n  - {file_type} file is empty: {filename}"
             test_result = False
 
         return test_result, message
@@ -1223,8 +1469,7 @@ class Config:
             folders.extend(self.store)
             folders.extend(os.path.dirname(folder) for folder in self.catalog_files)
         except Exception as e:
-            print(f"\n\nError: When attempting to build folder list: {e}")
-            exit(1)
+            _exit_with_error(f"Error: When attempting to build folder list: {e}")
 
         try:
             for folder in folders:
@@ -1233,14 +1478,12 @@ class Config:
                     print(f"\n\nWARNING: Created folder: {folder}")
 
                 if not os.path.isdir(folder):
-                    print(f"\n\nError: Not a folder: {folder}")
-                    exit(1)
+                    _exit_with_error(f"Error: Not a folder: {folder}")
 
                 self.test_folder_writable(folder)
 
         except Exception as e:
-            print(f"\n\nError: When attempting to test folder: {e}")
-            exit(1)
+            _exit_with_error(f"Error: When attempting to test folder: {e}")
 
     # --------------------------------------------------------------
     def test_folder_writable(self, folder: str) -> None:
@@ -1261,11 +1504,9 @@ class Config:
             try:
                 os.remove(test_file)
             except Exception as e:
-                print(f"\n\nError: Could not remove test file: {e}")
-                exit(1)
+                _exit_with_error(f"Error: Could not remove test file: {e}")
         except Exception:
-            print(f"\n\nError: Folder not writable: {folder}")
-            exit(1)
+            _exit_with_error(f"Error: Folder not writable: {folder}")
 
     # --------------------------------------------------------------
     def is_config_ok(self) -> bool:
@@ -1282,19 +1523,32 @@ class Config:
         test_result = True
         msg = f"\nError: In {self.config_file}:"
 
+        get_folders = [folder for folders in self.get.values() for folder in folders]
+
+        # list each parent folder once, instead of one existence test per folder
+        existing = self._list_existing_paths(
+            [
+                *self.input_path_list,
+                *self.store,
+                self.temp,
+                self.trash,
+                *get_folders,
+            ]
+        )
+
         for folder in self.input_path_list:
-            test_result, msg = self._test_folder(folder, "Post", msg)
+            test_result, msg = self._test_folder(folder, "Post", msg, existing)
 
         for folder in self.store:
-            test_result, msg = self._test_folder(folder, "Store", msg)
+            test_result, msg = self._test_folder(folder, "Store", msg, existing)
 
-        test_result, msg = self._test_folder(self.temp, "Temp", msg)
+        test_result, msg = self._test_folder(self.temp, "Temp", msg, existing)
 
-        test_result, msg = self._test_folder(self.trash, "Trash", msg)
+        test_result, msg = self._test_folder(self.trash, "Trash", msg, existing)
 
-        for folder in self.get:
+        for folder in get_folders:
             test_result, msg = self._test_folder(
-                folder=folder, folder_type="Get", message=msg
+                folder=folder, folder_type="Get", message=msg, existing=existing
             )
 
         for file in self.catalog_files:
@@ -13,17 +13,67 @@ Raises:
 # --------------------------------------------------------------
 import config_handler as cm
 
+import datetime
+import errno
+import functools
 import logging
 import os
 import shutil
-import pandas as pd
+import tempfile
+import time
 import hashlib
 import itertools
 import re
 from charset_normalizer import from_bytes
 
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+"""BLAKE3 module, used for file hashing if installed. BLAKE2b from hashlib is used otherwise."""
+
+FILE_MOVE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+"""Maximum number of threads used to move files. Moves are bound by filesystem latency, not by the CPU."""
+
+CONTENT_HEAD_SIZE = 64 * 1024
+"""Bytes compared directly at the start of files with the same size, before hashing their full content."""
+
+
+# --------------------------------------------------------------
+@functools.lru_cache(maxsize=4096)
+def _file_hash(file_path: str, size: int, mtime_ns: int, ctime_ns: int) -> bytes:
+    """Calculate the BLAKE3 hash of the file content, or BLAKE2b if blake3 is not installed.
+    Hashes are only compared between files in the same run, so the algorithm may differ between installations.
+    Size, modification and change times are only used as cache key, so a changed file is hashed again.
+    The change time catches files replaced by copies that preserve the modification time.
+
+    Args:
+        file_path (str): File to calculate the hash.
+        size (int): File size in bytes.
+        mtime_ns (int): File modification time in nanoseconds.
+        ctime_ns (int): File metadata change time in nanoseconds.
+
+    Returns:
+        bytes: Raw digest of the file content.
+
+    Raises:
+        OSError: If the file can't be read.
+    """
+
+    if blake3 is not None:
+        # memory mapped and hashed with SIMD kernels over multiple threads
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.digest()
+
+    # file_digest reads into a reused 256 KiB buffer and hashes it in C, releasing the GIL while hashing.
+    # The file is opened unbuffered, since the application buffer is already large
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "blake2b").digest()
 
 
 # --------------------------------------------------------------
@@ -31,63 +81,89 @@ from typing import List
 class FileHandler:
     config: cm.Config
     log: logging.Logger
+    _verified_folders: set[str] = field(default_factory=set, init=False, repr=False)
+    """Destination folders already checked or created in this run."""
 
     # --------------------------------------------------------------
-    def _get_all_folder_content(self, root_folder: str) -> list[str]:
-        """Get all files and folders recursively.
+    def _scan_folder(self, root_folder: str) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        """Get all files and folders recursively, with the directory entries from os.scandir.
         Similar to glob.glob("**", recursive=True) but including hidden files.
-
+        Entry type and stat results are cached by os.scandir, avoiding a new stat call for each item.
+        As in os.walk, symbolic links to folders are listed but not followed.
+        Items are yielded while folders are read, so the folder tree is never held in memory.
 
         Args:
             root_folder (str): Root directory to scan.
 
-        Returns:
-            list[str]: List of relative paths from root_folder.
+        Yields:
+            tuple[str, os.DirEntry[str]]: Relative path from root_folder and the corresponding directory entry.
         """
 
-        all_items = []
-        for dirpath, dirnames, filenames in os.walk(root_folder):
-            # Get relative path from root_folder
-            rel_dir = os.path.relpath(dirpath, root_folder)
+        pending = [("", root_folder)]
+        while pending:
+            rel_dir, folder = pending.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        rel_path = (
+                            os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        )
+                        yield rel_path, entry
 
-            # Add all subdirectories (with relative path)
-            for dirname in dirnames:
-                if rel_dir == ".":
-                    all_items.append(dirname)
-                else:
-                    all_items.append(os.path.join(rel_dir, dirname))
+                        try:
+                            walk_into = entry.is_dir() and not entry.is_symlink()
+                        except OSError:
+                            walk_into = False
 
-            # Add all files (with relative path)
-            for filename in filenames:
-                if rel_dir == ".":
-                    all_items.append(filename)
-                else:
-                    all_items.append(os.path.join(rel_dir, filename))
+                        if walk_into:
+                            pending.append((rel_path, entry.path))
+            except OSError:
+                # as in os.walk, folders that can't be read are skipped
+                continue
 
-        return all_items
+    # --------------------------------------------------------------
+    def _get_all_folder_content(self, root_folder: str) -> list[str]:
+        """Get all files recursively, leaving out folders.
+        Similar to glob.glob("**", recursive=True) but including hidden files.
+        The entry type cached by os.scandir is used, so no extra stat call is needed to tell files from folders.
+
+        Args:
+            root_folder (str): Root directory to scan.
+
+        Returns:
+            list[str]: List of relative paths from root_folder.
+        """
+
+        return [
+            rel_path
+            for rel_path, entry in self._scan_folder(root_folder)
+            if entry.is_file()
+        ]
 
     # --------------------------------------------------------------
-    def _filter_ignored_input(self, folder_content: list[str]) -> set[str]:
+    def _filter_ignored_input(
+        self, folder_content: Iterable[tuple[str, os.DirEntry[str]]]
+    ) -> Iterator[os.DirEntry[str]]:
         """Filter out items that match any configured ignore pattern.
 
         Args:
-            folder_content (list[str]): Relative paths from the input folder.
+            folder_content (Iterable[tuple[str, os.DirEntry[str]]]): Relative paths from the input folder and the corresponding directory entries.
 
         Returns:
-            set[str]: Input items excluding ignored entries.
+            Iterator[os.DirEntry[str]]: Directory entries of the input items excluding ignored entries.
         """
 
         if not self.config.input_to_ignore:
-            return set(folder_content)
+            return (entry for _, entry in folder_content)
 
-        return {
-            item
-            for item in folder_content
+        return (
+            entry
+            for item, entry in folder_content
             if not any(
-                pattern.search(item) or pattern.match(os.path.basename(item))
+                pattern.search(item) or pattern.match(entry.name)
                 for pattern in self.config.input_to_ignore
             )
-        }
+        )
 
     # --------------------------------------------------------------
     def move_to_temp(self, source_file: str) -> str | None:
@@ -106,45 +182,222 @@ class FileHandler:
         if source_file == target_file:
             return source_file
 
-        if os.path.exists(target_file):
-            # test if content match
-            if self._calculate_md5(target_file) == self._calculate_md5(source_file):
-                self.remove_file(source_file)
-                self.log.warning(
-                    f"File {filename} posted in more than one folder or duplicated in TEMP."
-                )
-                return None
-            else:
+        try:
+            # the move refuses to overwrite, so a name collision is only tested when it happens
+            try:
+                self._move(source_file, target_file)
+            except FileExistsError:
+                # test if content match
+                if self._same_content(target_file, source_file):
+                    self.remove_file(source_file)
+                    self.log.warning(
+                        "File %s posted in more than one folder or duplicated in TEMP.",
+                        filename,
+                    )
+                    return None
+
                 filename = self._add_timestamp_to_name(filename=filename)
                 target_file = os.path.join(self.config.temp, filename)
+                self._move(source_file, target_file)
 
-        try:
-            shutil.move(source_file, target_file)
             os.utime(target_file)
-            self.log.info(f"Moved {source_file} to {target_file}")
+            self.log.info("Moved %s to %s", source_file, target_file)
             return target_file
         except Exception as e:
-            self.log.error(f"Error moving {source_file} to {target_file}: {e}")
+            self.log.error("Error moving %s to %s: %s", source_file, target_file, e)
             return None
 
     # --------------------------------------------------------------
-    def _calculate_md5(self, file_path: str) -> str:
-        """Calculate the MD5 hash of the file content.
+    def _move(self, source_file: str, target_file: str) -> None:
+        """Move a file without overwriting an existing target.
+        In the same filesystem, a hard link is created and the source removed, which fails atomically if the target exists.
+        Falls back to a single rename, or shutil.move across filesystems, when hard links are not supported.
+
+        Args:
+            source_file (str): File to move.
+            target_file (str): Full path of the moved file.
+
+        Raises:
+            FileExistsError: If the target file already exists.
+            OSError: If the file can't be moved.
+        """
+
+        try:
+            if os.link in os.supports_follow_symlinks:
+                # move a symlink as itself, not as a link to the file it points to
+                os.link(source_file, target_file, follow_symlinks=False)
+            elif os.path.islink(source_file):
+                raise OSError("symbolic link moved by rename")
+            else:
+                os.link(source_file, target_file)
+        except FileExistsError:
+            raise
+        except OSError:
+            # hard links not supported by the filesystem or target in another filesystem
+            pass
+        else:
+            try:
+                os.unlink(source_file)
+            except OSError:
+                # keep a single copy of the file, at the source
+                os.unlink(target_file)
+                raise
+            return
+
+        # os.rename overwrites existing files on POSIX systems, so test it first, as expected by callers
+        if os.path.lexists(target_file):
+            raise FileExistsError(f"Target file already exists: {target_file}")
+
+        try:
+            os.rename(source_file, target_file)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+            shutil.move(source_file, target_file)
+
+    # --------------------------------------------------------------
+    def _replace(self, source_file: str, target_file: str) -> None:
+        """Move a file over any existing target, in a single atomic rename when both paths are in the same filesystem.
+
+        Args:
+            source_file (str): File to move.
+            target_file (str): Full path of the file to replace.
+
+        Raises:
+            OSError: If the file can't be moved.
+        """
+
+        try:
+            os.replace(source_file, target_file)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+            try:
+                os.remove(target_file)
+            except FileNotFoundError:
+                pass
+            self._move(source_file, target_file)
+
+    # --------------------------------------------------------------
+    def _copy(self, source_file: str, target_file: str) -> None:
+        """Copy a file and its permission bits, as shutil.copy, overwriting any existing target.
+        Where available (Linux), os.copy_file_range keeps the data in the kernel, allowing reflinks in filesystems that support them.
+        Falls back to shutil.copyfile, that uses sendfile on Linux and large buffers elsewhere.
+
+        Args:
+            source_file (str): File to copy.
+            target_file (str): Full path of the copy.
+
+        Raises:
+            OSError: If the file can't be copied.
+        """
+
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            with open(source_file, "rb") as source, open(target_file, "wb") as target:
+                source_fd = source.fileno()
+                target_fd = target.fileno()
+                source_size = os.fstat(source_fd).st_size
+                block_size = max(source_size, 2**23)
+                offset = 0
+                try:
+                    while sent := os.copy_file_range(source_fd, target_fd, block_size):
+                        offset += sent
+                    # some filesystems (e.g. procfs, some FUSE mounts) return 0 without copying anything
+                    copied = offset > 0 or source_size == 0
+                except OSError:
+                    # not supported for this pair of files, as between some filesystems. Only handled before any data is written
+                    if offset:
+                        raise
+
+        if not copied:
+            shutil.copyfile(source_file, target_file)
+
+        shutil.copymode(source_file, target_file)
+
+    # --------------------------------------------------------------
+    def _copy_replacing(self, source_file: str, target_file: str) -> None:
+        """Copy a file to a temporary name in the target folder and rename it over any existing target.
+        The existing target is replaced instead of truncated, so files hard linked to it by the mirror are not changed and readers never see a partial file.
+
+        Args:
+            source_file (str): File to copy.
+            target_file (str): Full path of the copy.
+
+        Raises:
+            OSError: If the file can't be copied.
+        """
+
+        handle, temp_file = tempfile.mkstemp(
+            prefix=".", suffix=".tmp", dir=os.path.dirname(target_file) or "."
+        )
+        os.close(handle)
+        try:
+            self._copy(source_file, temp_file)
+            os.replace(temp_file, target_file)
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+
+    # --------------------------------------------------------------
+    def _calculate_hash(self, file_path: str) -> bytes:
+        """Calculate the hash of the file content, used only to compare files for equality.
+        BLAKE3 is used if installed, falling back to BLAKE2b from the standard library. Both are faster than MD5 on 64 bit processors.
+        Hashes are cached by path, size, modification and change times, so unchanged files are not read again.
+
+        Args:
+            file_path (str): File to calculate the hash.
+
+        Returns:
+            bytes: Raw digest of the file content.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+
+        stat = os.stat(file_path)
+
+        return _file_hash(file_path, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+    # --------------------------------------------------------------
+    def _same_content(self, file_a: str, file_b: str) -> bool:
+        """Test if two files have the same content, comparing their hashes.
+        Files with different sizes are not read, since their content can't match.
+        Otherwise, the first bytes of both files are compared, which is enough to tell most different files and all small files apart.
+        Only if those match, both files are hashed in parallel threads, overlapping the reads of both files.
 
         Args:
-            file_path (str): File to calculate the MD5 hash.
+            file_a (str): First file to compare.
+            file_b (str): Second file to compare.
 
         Returns:
-            str: MD5 hash of the file content.
+            bool: True if both files have the same content.
 
         Raises: None
         """
 
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        size = os.path.getsize(file_a)
+        if size != os.path.getsize(file_b):
+            return False
+
+        # buffered reads, so that a short read from the OS is completed up to the requested size
+        with open(file_a, "rb") as f_a, open(file_b, "rb") as f_b:
+            if f_a.read(CONTENT_HEAD_SIZE) != f_b.read(CONTENT_HEAD_SIZE):
+                return False
+
+        # the whole content was already compared
+        if size <= CONTENT_HEAD_SIZE:
+            return True
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hash_a, hash_b = executor.map(self._calculate_hash, (file_a, file_b))
+
+        return hash_a == hash_b
 
     # --------------------------------------------------------------
     def remove_file(self, file: str) -> None:
@@ -156,11 +409,11 @@ class FileHandler:
 
         try:
             os.remove(file)
-            self.log.info(f"Removed the file {file}")
+            self.log.info("Removed the file %s", file)
         except FileNotFoundError:
             pass
         except Exception as e:
-            self.log.error(f"Error removing {file}: {e}")
+            self.log.error("Error removing %s: %s", file, e)
 
     # --------------------------------------------------------------
     def remove_file_list(self, files: set[str]) -> None:
@@ -186,7 +439,7 @@ class FileHandler:
         """
 
         name, ext = os.path.splitext(filename)
-        timestamp = pd.to_datetime("now").strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         if variant:
             return f"{name}_{timestamp}-{variant}{ext}"
         else:
@@ -211,26 +464,22 @@ class FileHandler:
         trashed_file = os.path.join(self.config.trash, filename)
 
         try:
-            shutil.move(file, self.config.trash)
-        except Exception as e:
-            # FileExistsError not functioning as expected for windows in current version of shutil. Need to handle it with additional test
-            if not os.path.exists(file):
-                self.log.error(f"Error moving {file} to trash folder: {e}")
-                return
-
-            if os.path.exists(trashed_file):
-                if overwrite:
-                    self.remove_file(trashed_file)
-                    self.log.info(
-                        f"Removed the file {trashed_file} in the trash folder."
-                    )
-
-                # marked to not overwrite but the content is the same
-                elif self._calculate_md5(trashed_file) == self._calculate_md5(file):
-                    self.remove_file(trashed_file)
-                    self.log.info(
-                        f"The file {file} is already in the trash folder with the same content."
-                    )
+            self._move(file, trashed_file)
+        except FileExistsError:
+            # errors raised in this handler skip the sibling handler below, so they are caught here
+            try:
+                # marked to overwrite, or marked to not overwrite but the content is the same
+                if overwrite or self._same_content(trashed_file, file):
+                    self._replace(file, trashed_file)
+                    if overwrite:
+                        self.log.info(
+                            "Replaced the file %s in the trash folder.", trashed_file
+                        )
+                    else:
+                        self.log.info(
+                            "The file %s is already in the trash folder with the same content.",
+                            file,
+                        )
 
                 # marked to not overwrite and the content is different
                 else:
@@ -245,34 +494,66 @@ class FileHandler:
                         new_trashed_file = os.path.join(
                             self.config.trash, trashed_filename
                         )
+                        # os.rename would silently overwrite an existing variant on POSIX systems
                         try:
-                            os.rename(trashed_file, new_trashed_file)
+                            self._move(trashed_file, new_trashed_file)
                             rename_failed = False
-                        except Exception as e:
+                        except FileExistsError as e:
                             self.log.warning(
-                                f"Duplicate name for {trashed_filename} in trash. Trying variant"
+                                "Duplicate name for %s in trash. Trying variant",
+                                trashed_filename,
                             )
                             variant = variant + 1
                             if variant > self.config.maximum_file_variations:
                                 self.log.error(
-                                    f"Too many variants of {filename} in trash folder."
+                                    "Too many variants of %s in trash folder.", filename
                                 )
                                 raise Exception(
                                     f"Too many variants of the same file in trash folder. Check folder properties. Error: {e}"
                                 )
 
-                    self.log.info(f"Renamed {filename} to {trashed_filename} in trash.")
-
-                # once handled the trash file situation, move the incoming file to trash
-                shutil.move(file, self.config.trash)
+                    self.log.info(
+                        "Renamed %s to %s in trash.", filename, trashed_filename
+                    )
 
-            # error is not due to existing file in trash folder
-            else:
-                self.log.error(f"Error moving {file} to trash folder: {e}")
+                    # once handled the trash file situation, move the incoming file to trash
+                    self._move(file, trashed_file)
+            except Exception as e:
+                self.log.error("Error moving %s to trash folder: %s", file, e)
                 return
 
-        os.utime(trashed_file)
-        self.log.info(f"Moved to {self.config.trash} the file {filename}")
+        # error is not due to existing file in trash folder
+        except Exception as e:
+            self.log.error("Error moving %s to trash folder: %s", file, e)
+            return
+
+        try:
+            os.utime(trashed_file)
+        except OSError as e:
+            self.log.warning("Error updating timestamp of %s: %s", trashed_file, e)
+
+        self.log.info("Moved to %s the file %s", self.config.trash, filename)
+
+    # --------------------------------------------------------------
+    def _ensure_folder(self, folder: str) -> None:
+        """Create the destination folder if it does not exist.
+        Folders are checked only once per run, since they are not expected to be removed while the application is running.
+
+        Args:
+            folder (str): Folder to check.
+
+        Raises:
+            OSError: If the folder can't be created.
+        """
+
+        if folder in self._verified_folders:
+            return
+
+        if not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+            self.log.info("Created folder %s", folder)
+
+        self._verified_folders.add(folder)
 
     # --------------------------------------------------------------
     def move_to_store(self, files: List[str]) -> None:
@@ -282,42 +563,51 @@ class FileHandler:
             files (List[str]): File(s) to move to the store folder.
         """
 
+        # read config values once, instead of once per file
+        stores = self.config.store
+        store_data_overwrite = self.config.store_data_overwrite
+        trash_data_overwrite = self.config.trash_data_overwrite
+
         for file in files:
             filename = os.path.basename(file)
 
-            for store in self.config.store:
-                if not os.path.exists(store):
-                    try:
-                        os.makedirs(store, exist_ok=True)
-                        self.log.info(f"Created store folder {store}")
-                    except Exception as e:
-                        self.log.error(f"Error creating store folder {store}: {e}")
-                        return
+            for store_number, store in enumerate(stores, start=1):
+                try:
+                    self._ensure_folder(store)
+                except Exception as e:
+                    self.log.error("Error creating store folder %s: %s", store, e)
+                    return
 
                 stored_file = os.path.join(store, filename)
 
                 try:
-                    shutil.copy(file, stored_file)
-                except FileExistsError:
-                    self.trash_it(
-                        file=stored_file, overwrite=self.config.store_data_overwrite
-                    )
-                    shutil.copy(file, stored_file)
+                    # if overwrite is not set, the existing file is kept in trash
+                    if not store_data_overwrite and os.path.exists(stored_file):
+                        self.trash_it(file=stored_file, overwrite=trash_data_overwrite)
+
+                    # copy to all but the last store, where the file is moved, avoiding a copy and a removal
+                    if store_number < len(stores):
+                        self._copy(file, stored_file)
+                    elif store_data_overwrite:
+                        self._replace(file, stored_file)
+                    else:
+                        self._move(file, stored_file)
                 except PermissionError as e:
                     self.log.error(
-                        f"Permission error moving {file} to store folder: {e}"
+                        "Permission error moving %s to store folder: %s", file, e
                     )
                     return
                 except Exception as e:
-                    self.log.error(f"Error moving {file} to store folder: {e}")
+                    self.log.error("Error moving %s to store folder: %s", file, e)
                     return
-                finally:
-                    os.utime(
-                        stored_file
-                    )  # force the file timestamp to the current time to avoid being cleaned by the clean process before the clean period is over
-                    self.log.info(f"Moved to {store} the file {filename}")
 
-            self.remove_file(file)
+                # force the file timestamp to the current time to avoid being cleaned by the clean process before the clean period is over
+                os.utime(stored_file)
+                self.log.info("Moved to %s the file %s", store, filename)
+
+            # without store folders, the processed file is simply removed
+            if not stores:
+                self.remove_file(file)
 
     # --------------------------------------------------------------
     def publish_data_file(self, files_to_publish: set[str], target_key: str) -> bool:
@@ -331,90 +621,143 @@ class FileHandler:
         """
 
         publish_succeeded = True
+        copies = []
 
-        for file in files_to_publish:
-            filename = os.path.basename(file)
+        # read config values and methods once, instead of once per file
+        publish_folders = self.config.get[target_key]
+        get_data_overwrite = self.config.get_data_overwrite
+        trash_data_overwrite = self.config.trash_data_overwrite
+        copy_file = self._copy_replacing
 
-            # copy file to all publish folders
-            for publish_folder in self.config.get[target_key]:
-                try:
-                    target_file = os.path.join(publish_folder, filename)
-                    if os.path.exists(target_file):
-                        if self.config.get_data_overwrite:
-                            self.remove_file(target_file)
-                        else:
+        # one worker per publish folder, so copies to different folders overlap
+        with ThreadPoolExecutor(max_workers=max(len(publish_folders), 1)) as executor:
+            for file in files_to_publish:
+                filename = os.path.basename(file)
+
+                # copy file to all publish folders
+                for publish_folder in publish_folders:
+                    try:
+                        # existing files are trashed here, since trash_it is not safe to run in parallel.
+                        # If overwrite is set, the copy replaces the existing file, so it is not tested nor removed first
+                        target_file = os.path.join(publish_folder, filename)
+                        if not get_data_overwrite and os.path.exists(target_file):
                             self.trash_it(
                                 file=target_file,
-                                overwrite=self.config.trash_data_overwrite,
+                                overwrite=trash_data_overwrite,
                             )
 
-                    shutil.copy(file, publish_folder)
-                    self.log.info(f"Copied {filename} to {publish_folder}")
+                        copies.append(
+                            (
+                                file,
+                                filename,
+                                publish_folder,
+                                executor.submit(copy_file, file, target_file),
+                            )
+                        )
+                    except Exception as e:
+                        self.log.error(
+                            "Error publishing %s to %s: %s", file, publish_folder, e
+                        )
+                        publish_succeeded = False
+
+            for file, filename, publish_folder, copy in copies:
+                try:
+                    copy.result()
+                    self.log.info("Copied %s to %s", filename, publish_folder)
                 except Exception as e:
-                    self.log.error(f"Error publishing {file} to {publish_folder}: {e}")
+                    self.log.error(
+                        "Error publishing %s to %s: %s", file, publish_folder, e
+                    )
                     publish_succeeded = False
 
         return publish_succeeded
 
     # --------------------------------------------------------------
-    def _remove_unused_subfolder(self, folders: set[str]) -> None:
-        """Remove empty subfolder from the post folder.
+    def _remove_unused_subfolder(self, folders: set[str] | list[str]) -> None:
+        """Remove empty subfolder from the post folder. Folders that are not empty are kept.
 
         Args:
-            folders (set[str]): Set of folders to remove.
+            folders (set[str] | list[str]): Folders to remove.
         """
 
-        for folder in folders:
-            if not os.listdir(folder):
-                try:
-                    os.rmdir(folder)
-                    self.log.info(f"Removed folder {folder}")
-                except Exception as e:
-                    self.log.warning(f"Error removing folder {folder}: {e}")
+        # remove deeper folders first, so parents emptied by the removal are also removed
+        for folder in sorted(folders, key=len, reverse=True):
+            # rmdir only removes empty folders, so there is no need to list the folder content first
+            try:
+                os.rmdir(folder)
+                self.log.info("Removed folder %s", folder)
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    self.log.warning("Error removing folder %s: %s", folder, e)
 
     # --------------------------------------------------------------
-    def _file_matching(
-        self,
-        filename: str,
-        regex_rules: dict[str, re.Pattern],
-        files_to_process: dict[str, set[str]],
-    ) -> tuple[dict[str, set[str]], bool]:
-        """Check if the file matches any of the regex patterns in the rules.
+    def _run_by_name(
+        self, task: Callable[[str], Any], files: Iterable[str]
+    ) -> dict[str, Any]:
+        """Run a task for each file using a pool of threads, returning the results by file.
+        Files with the same name are handled by the same thread, one after the other, since tasks moving files to a common folder handle name collisions there.
+
+        Args:
+            task (Callable[[str], Any]): Function called with each file path.
+            files (Iterable[str]): Files to process. Paths must be unique.
+
+        Returns:
+            dict[str, Any]: Task result for each file.
+        """
+
+        # group files by name, so that each group is handled in sequence
+        files_by_name = {}
+        for file in files:
+            files_by_name.setdefault(os.path.basename(file), []).append(file)
+
+        def run_group(group: List[str]) -> list[tuple[str, Any]]:
+            return [(file, task(file)) for file in group]
+
+        if len(files_by_name) < 2:
+            results = map(run_group, files_by_name.values())
+            return dict(itertools.chain.from_iterable(results))
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(files_by_name), FILE_MOVE_WORKERS)
+        ) as executor:
+            results = executor.map(run_group, files_by_name.values())
+            return dict(itertools.chain.from_iterable(results))
+
+    # --------------------------------------------------------------
+    def _match_table(self, name: str, regex_rules: dict[str, re.Pattern]) -> str | None:
+        """Return the first table whose regex pattern matches the file name.
 
         Args:
-            filename (str): Name of the file to check.
+            name (str): Base name of the file to check.
             regex_rules (dict[str, re.Pattern]): Dictionary of regex patterns to check against.
 
         Returns:
-            tuple[dict[str, set[str]], bool]: Dictionary of matched files by category and a boolean indicating if a match was found.
+            str | None: Matched table name, or None if no pattern matches.
         """
 
-        name = os.path.basename(filename)
         for table, pattern in regex_rules.items():
             if pattern.match(name):
-                file_in_temp = self.move_to_temp(filename)
-                if file_in_temp:
-                    files_to_process[table].add(file_in_temp)
-                return files_to_process, True
+                return table
 
-        return files_to_process, False
+        return None
 
     # --------------------------------------------------------------
     def sort_and_clean(
         self,
-        folder_content: set[str],
-        metadata_to_process: dict[str, set[str]],
-        data_files_to_process: dict[str, set[str]],
+        folder_content: Iterable[os.DirEntry[str]],
+        metadata_to_process: dict[str, set[str]] | None = None,
+        data_files_to_process: dict[str, set[str]] | None = None,
     ) -> tuple[dict[str, set[str]], dict[str, set[str]], bool, bool]:
         """Move files listed according to regex patterns to the temp folder and return the list of files to process
             If files are already in the temp folder, they are not moved.
+            Files are classified first and then moved using a pool of threads.
             Remove files with unrecognized patterns if discard_invalid_data_files is set to True
             Remove any empty subfolder after moving files.
 
         Args:
-            folder_content (set[str]): Set of files to sort.
-            metadata_to_process (dict[str, set[str]]): Existing dictionary of metadata files by category. Default is None, which will create a new dict.
-            data_files_to_process (dict[str, set[str]]): Existing dictionary of data files by category. Default is None, which will create a new dict.
+            folder_content (Iterable[os.DirEntry[str]]): Directory entries of the files and folders to sort.
+            metadata_to_process (dict[str, set[str]] | None): Existing dictionary of metadata files by category. Default is None, which will create a new dict.
+            data_files_to_process (dict[str, set[str]] | None): Existing dictionary of data files by category. Default is None, which will create a new dict.
 
         Returns:
             - dict[str, set[str]]: Dictionary with table names as keys and set of metadata files to process as values
@@ -426,45 +769,65 @@ class FileHandler:
         """
 
         folders = set()
-
-        metadata_found = False
-        data_found = False
-        for item in folder_content:
-            # Check if the item is a file
-            if os.path.isfile(item):
-                file_matched = False
-
+        metadata_files = {}
+        data_files = {}
+        files_to_trash = []
+
+        # read config values and methods once, instead of once per file
+        match_table = self._match_table
+        metadata_file_regex = self.config.metadata_file_regex
+        data_file_regex = self.config.data_file_regex
+
+        # new dictionaries are created on each call, never shared between calls as a mutable default would be
+        if metadata_to_process is None:
+            metadata_to_process = {table: set() for table in metadata_file_regex}
+        if data_files_to_process is None:
+            data_files_to_process = {table: set() for table in data_file_regex}
+        discard_invalid_data_files = self.config.discard_invalid_data_files
+
+        # classify all files first, so that the moves can run in parallel
+        for entry in folder_content:
+            item = entry.path
+
+            # Check if the item is a file, using the type cached by os.scandir
+            if entry.is_file():
                 # test if file contains metadata to be processed
-                metadata_to_process, file_matched = self._file_matching(
-                    filename=item,
-                    regex_rules=self.config.metadata_file_regex,
-                    files_to_process=metadata_to_process,
-                )
-
-                # if already found, continue to the next file
-                if file_matched:
-                    metadata_found = True
+                table = match_table(entry.name, metadata_file_regex)
+                if table is not None:
+                    metadata_files[item] = table
                     continue
 
                 # test if file contains data to be arranged
-                data_files_to_process, file_matched = self._file_matching(
-                    filename=item,
-                    regex_rules=self.config.data_file_regex,
-                    files_to_process=data_files_to_process,
-                )
-
-                if file_matched:
-                    data_found = True
+                table = match_table(entry.name, data_file_regex)
+                if table is not None:
+                    data_files[item] = table
                     continue
 
                 # If file doesn't match any pattern, optionally trash it
-                if self.config.discard_invalid_data_files:
-                    self.trash_it(file=item, overwrite=self.config.trash_data_overwrite)
+                if discard_invalid_data_files:
+                    files_to_trash.append(item)
 
             # if item is a folder, simply add it to the subfolder list to be removed later
             else:
                 folders.add(item)
 
+        files_in_temp = self._run_by_name(
+            self.move_to_temp, itertools.chain(metadata_files, data_files)
+        )
+
+        for files, files_to_process in (
+            (metadata_files, metadata_to_process),
+            (data_files, data_files_to_process),
+        ):
+            for item, table in files.items():
+                if files_in_temp[item]:
+                    files_to_process[table].add(files_in_temp[item])
+
+        metadata_found = bool(metadata_files)
+        data_found = bool(data_files)
+
+        self._trash_files(files_to_trash)
+
         self._remove_unused_subfolder(folders)
 
         return metadata_to_process, data_files_to_process, metadata_found, data_found
@@ -489,48 +852,31 @@ class FileHandler:
             table: set() for table in self.config.metadata_file_regex.keys()
         }
         data_to_process = {table: set() for table in self.config.data_file_regex.keys()}
-        metadata_found_any_folder = False
-        metadata_found_now = False
-        data_found_any_folder = False
-        data_found_now = False
+        folder_contents = []
 
         # Loop through all post folders and temp folder
         for input_folder in self.config.input_path_list:
-            folder_content = self._get_all_folder_content(input_folder)
+            # remove files and folders to ignore while scanning. Entries already hold the path with the input folder
+            folder_content = self._filter_ignored_input(self._scan_folder(input_folder))
 
-            if not folder_content:
-                self.log.debug(f"Folder {input_folder} is empty.")
+            # files are processed as the folder is scanned, so peek the first item to test if there is anything to process
+            first_item = next(folder_content, None)
+
+            if first_item is None:
+                self.log.debug("Folder %s is empty.", input_folder)
             else:
-                # remove files and folders to ignore from the list
-                folder_content = self._filter_ignored_input(folder_content)
+                self.log.debug("Folder %s has files/folders to process.", input_folder)
 
-                # add path to filenames
-                folder_content = set(
-                    map(lambda x: os.path.join(input_folder, x), folder_content)
-                )
-                self.log.debug(
-                    f"Folder {input_folder} has {len(folder_content)} files/folders to process."
-                )
+                folder_contents.append(itertools.chain((first_item,), folder_content))
 
-                (
-                    metadata_to_process,
-                    data_to_process,
-                    metadata_found_now,
-                    data_found_now,
-                ) = self.sort_and_clean(
-                    folder_content,
-                    metadata_to_process=metadata_to_process,
-                    data_files_to_process=data_to_process,
-                )
+        if not folder_contents:
+            return metadata_to_process, data_to_process, False, False
 
-                metadata_found_any_folder |= metadata_found_now
-                data_found_any_folder |= data_found_now
-
-        return (
-            metadata_to_process,
-            data_to_process,
-            metadata_found_any_folder,
-            data_found_any_folder,
+        # sort all folders in a single pass, so that files from all folders are moved in the same batch
+        return self.sort_and_clean(
+            itertools.chain.from_iterable(folder_contents),
+            metadata_to_process=metadata_to_process,
+            data_files_to_process=data_to_process,
         )
 
     # --------------------------------------------------------------
@@ -544,50 +890,56 @@ class FileHandler:
         Raises: None
         """
 
-        # Get content from folder
-        folder_content = self._get_all_folder_content(folder)
-
-        # Remove files and folder to ignore from the list of cleaning
-        folder_content = self._filter_ignored_input(folder_content)
-
-        if not folder_content:
-            self.log.info(f"Nothing to clean in {folder}.")
-            return
-
-        self.log.info(
-            f"Checking {len(folder_content)} files/folders in {folder} for cleaning"
-        )
+        # Get content from folder, removing files and folder to ignore from the list of cleaning
+        folder_content = self._filter_ignored_input(self._scan_folder(folder))
 
         folder_to_remove = []
+        files_to_trash = []
+        checked = 0
+
+        # files created before this epoch time are older than the clean period
+        cutoff = time.time() - self.config.clean_period.total_seconds()
 
-        for item in folder_content:
-            item_name = os.path.join(folder, item)
-            # Check if the item is a file
-            if os.path.isfile(item_name):
+        for entry in folder_content:
+            checked += 1
+            item_name = entry.path
+            # Check if the item is a file, using the type and stat results cached by os.scandir
+            if entry.is_file():
                 # Check if the file is older than the clean period
-                file_creation_time = pd.to_datetime(
-                    os.path.getctime(item_name), unit="s"
-                )
-                if (
-                    file_creation_time
-                    < pd.to_datetime("now") - self.config.clean_period
-                ):
-                    self.trash_it(
-                        file=item_name, overwrite=self.config.trash_data_overwrite
-                    )
+                if entry.stat().st_ctime < cutoff:
+                    files_to_trash.append(item_name)
             else:
                 folder_to_remove.append(item_name)
 
-        # Remove empty subfolder after moving files.
-        if folder_to_remove:
-            for folder in folder_to_remove:
-                # New files that may have appeared in the subfolder will be processed in the next run, so test if it is empty before removing
-                if not os.listdir(folder):
-                    try:
-                        os.rmdir(folder)
-                        self.log.info(f"Removed folder {folder}")
-                    except Exception as e:
-                        self.log.warning(f"Error removing folder {folder}: {e}")
+        if not checked:
+            self.log.info("Nothing to clean in %s.", folder)
+            return
+
+        self.log.info("Checked %s files/folders in %s for cleaning", checked, folder)
+
+        self._trash_files(files_to_trash)
+
+        # Remove empty subfolder after moving files. New files that may have appeared in the subfolder will be processed in the next run
+        self._remove_unused_subfolder(folder_to_remove)
+
+    # --------------------------------------------------------------
+    def _trash_files(self, files: List[str]) -> None:
+        """Move a list of files to the trash folder, using a pool of threads.
+
+        Args:
+            files (List[str]): Files to move to the trash folder.
+
+        Returns: None
+
+        Raises: None
+        """
+
+        overwrite = self.config.trash_data_overwrite
+
+        # trash_it logs its own errors, so results are not used
+        self._run_by_name(
+            lambda file: self.trash_it(file=file, overwrite=overwrite), files
+        )
 
     # --------------------------------------------------------------
     def clean_folders(self) -> None:
@@ -599,7 +951,7 @@ class FileHandler:
 
         Raises: None"""
 
-        if pd.to_datetime("now") - self.config.last_clean > self.config.clean_period:
+        if datetime.datetime.now() - self.config.last_clean > self.config.clean_period:
             for input_folder in self.config.input_path_list:
                 self._clean_old_in_folder(input_folder)
 
@@ -608,11 +960,11 @@ class FileHandler:
             try:
                 self.config.set_last_clean()
             except Exception as e:
-                self.log.error(f"Error setting last clean time: {e}")
+                self.log.error("Error setting last clean time: %s", e)
 
     # --------------------------------------------------------------
     def mirror_raw_data(self) -> None:
-        """Mirror the raw data between multiple config.get folders.
+        """Mirror the raw data between the config.get folders of each data type.
         Folder comparison is based on file names only. Differences in content will be ignored.
 
         Args: None
@@ -622,45 +974,90 @@ class FileHandler:
         Raises: None
         """
 
-        # Test if self.config.get has multiple folders
-        if len(self.config.get) > 1:
-            self.log.info(f"Mirroring raw data between {len(self.config.get)} folders.")
+        # files of each data type are published to all folders listed for it, so only those are mirrored
+        for get_folders in self.config.get.values():
+            # Test if the data type has multiple folders
+            if len(get_folders) < 2:
+                continue
 
-            # get the content from all folders into a dictionary of lists
+            self.log.info("Mirroring raw data between %s folders.", len(get_folders))
+
+            # get the content from all folders into a dictionary of sets, so that comparisons are done by hash lookups
             folders = {}
-            for folder in self.config.get:
-                folders[folder] = self._get_all_folder_content(folder)
-
-            # Use itertools.combinations to generate pairs of folders for comparison
-            for folder1, folder2 in itertools.combinations(folders.keys(), 2):
-                # Compare pair of folders
-                missing_in_folder2 = [
-                    file for file in folders[folder1] if file not in folders[folder2]
-                ]
-                missing_in_folder1 = [
-                    file for file in folders[folder2] if file not in folders[folder1]
-                ]
-
-                # Copy missing files from folder1 to folder2
-                for file in missing_in_folder2:
-                    try:
-                        shutil.copy(os.path.join(folder1, file), folder2)
-                        self.log.info(f"Copied {file} from {folder1} to {folder2}")
-                    except Exception as e:
-                        self.log.error(
-                            f"Error copying {file} from {folder1} to {folder2}: {e}"
-                        )
+            for folder in get_folders:
+                folders[folder] = frozenset(self._get_all_folder_content(folder))
+
+            with ThreadPoolExecutor(max_workers=FILE_MOVE_WORKERS) as executor:
+                # Use itertools.combinations to generate pairs of folders for comparison
+                for folder1, folder2 in itertools.combinations(folders.keys(), 2):
+                    # Compare pair of folders
+                    missing_in_folder2 = folders[folder1] - folders[folder2]
+                    missing_in_folder1 = folders[folder2] - folders[folder1]
+
+                    # copies of a pair have distinct targets and run in parallel. Pairs run in sequence, since they share folders
+                    copies = [
+                        executor.submit(self._mirror_file, file, folder1, folder2)
+                        for file in missing_in_folder2
+                    ]
+                    copies.extend(
+                        executor.submit(self._mirror_file, file, folder2, folder1)
+                        for file in missing_in_folder1
+                    )
 
-                # Copy missing files from folder2 to folder1
-                for file in missing_in_folder1:
-                    try:
-                        shutil.copy(os.path.join(folder2, file), folder1)
-                        self.log.info(f"Copied {file} from {folder2} to {folder1}")
-                    except Exception as e:
-                        self.log.error(
-                            f"Error copying {file} from {folder2} to {folder1}: {e}"
-                        )
+                    # _mirror_file logs its own errors, so results are only collected to wait for completion
+                    for copy in copies:
+                        copy.result()
+
+                    # copied files are now in both folders, so they are not copied again from other folders
+                    folders[folder1] |= missing_in_folder1
+                    folders[folder2] |= missing_in_folder2
+
+    # --------------------------------------------------------------
+    def _mirror_file(self, file: str, source_folder: str, target_folder: str) -> None:
+        """Copy a file between mirrored folders, keeping its relative path.
+        Files in subfolders are copied to the same subfolder, so that they are found by the next comparison.
+        If mirror_hard_links is set, the file is hard linked instead, falling back to a copy if the folders are in different filesystems.
+
+        Args:
+            file (str): Path of the file relative to the mirrored folders.
+            source_folder (str): Folder where the file exists.
+            target_folder (str): Folder where the file is missing.
+
+        Returns: None
+
+        Raises: None
+        """
+
+        try:
+            target_file = os.path.join(target_folder, file)
+            target_subfolder = os.path.dirname(target_file)
+            if target_subfolder != target_folder:
+                os.makedirs(target_subfolder, exist_ok=True)
 
+            source_file = os.path.join(source_folder, file)
+            if self.config.mirror_hard_links:
+                try:
+                    os.link(source_file, target_file)
+                    self.log.info(
+                        "Linked %s from %s to %s", file, source_folder, target_folder
+                    )
+                    return
+                except OSError:
+                    # hard links not supported or folders in different filesystems
+                    pass
+
+            self._copy(source_file, target_file)
+            self.log.info("Copied %s from %s to %s", file, source_folder, target_folder)
+        except Exception as e:
+            self.log.error(
+                "Error copying %s from %s to %s: %s",
+                file,
+                source_folder,
+                target_folder,
+                e,
+            )
+
+    # --------------------------------------------------------------
     def test_file_encoding(self, file_path: str) -> str:
         """Test the encoding of a file and return the encoding type.
             If the encoding cannot be determined, return 'utf-8' as default.
@@ -678,26 +1075,28 @@ class FileHandler:
 
             # Check for common BOMs and return appropriate encoding
             if raw_data.startswith(b"\xef\xbb\xbf"):
-                self.log.debug(f"UTF-8 BOM detected in {file_path}. Using 'utf-8-sig'.")
+                self.log.debug(
+                    "UTF-8 BOM detected in %s. Using 'utf-8-sig'.", file_path
+                )
                 return "utf-8-sig"
             elif raw_data.startswith(b"\xff\xfe\x00\x00"):
                 self.log.debug(
-                    f"UTF-32 LE BOM detected in {file_path}. Using 'utf-32'."
+                    "UTF-32 LE BOM detected in %s. Using 'utf-32'.", file_path
                 )
                 return "utf-32"
             elif raw_data.startswith(b"\x00\x00\xfe\xff"):
                 self.log.debug(
-                    f"UTF-32 BE BOM detected in {file_path}. Using 'utf-32'."
+                    "UTF-32 BE BOM detected in %s. Using 'utf-32'.", file_path
                 )
                 return "utf-32"
             elif raw_data.startswith(b"\xff\xfe"):
                 self.log.debug(
-                    f"UTF-16 LE BOM detected in {file_path}. Using 'utf-16'."
+                    "UTF-16 LE BOM detected in %s. Using 'utf-16'.", file_path
                 )
                 return "utf-16"
             elif raw_data.startswith(b"\xfe\xff"):
                 self.log.debug(
-                    f"UTF-16 BE BOM detected in {file_path}. Using 'utf-16'."
+                    "UTF-16 BE BOM detected in %s. Using 'utf-16'.", file_path
                 )
                 return "utf-16"
 
@@ -717,13 +1116,16 @@ class FileHandler:
                         return results[0].encoding
 
                 self.log.debug(
-                    f"Could not determine encoding for {file_path} using chunk size {chunk_size}. Trying to increase it."
+                    "Could not determine encoding for %s using chunk size %s. Trying to increase it.",
+                    file_path,
+                    chunk_size,
                 )
 
                 chunk_size *= 2
 
                 if chunk_size > limit:
                     self.log.warning(
-                        f"Could not determine encoding for {file_path}. Defaulting to 'utf-8'."
+                        "Could not determine encoding for %s. Defaulting to 'utf-8'.",
+                        file_path,
                     )
                     return "utf-8"
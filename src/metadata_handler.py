@@ -13,6 +13,10 @@ Raises:
 import config_handler as cm
 import file_handler as fm
 
+import bisect
+import datetime
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 import pandas as pd
@@ -22,9 +26,18 @@ import base58
 import json
 from typing import Any
 import copy
+from openpyxl import Workbook
 from pyqvd import QvdTable
 from pyqvd.io import QvdFileWriterOptions
 
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_READ_ENGINE: str = "calamine"
+except ImportError:
+    EXCEL_READ_ENGINE = "openpyxl"
+"""Engine used to read Excel files. The Rust based calamine parser is used if installed."""
+
 
 # ---------------------------------------------------------------
 # Constants used only in this module and not affected by the config file
@@ -35,6 +48,23 @@ AGGREGATION_SEPARATOR = ", "
 NO_TABLE_FOUND = "ntf"
 
 
+# --------------------------------------------------------------
+def read_excel_sheets(file: str) -> dict[str, pd.DataFrame]:
+    """Read all worksheets from an Excel file with string values.
+    Does not depend on DataHandler state, so it can be run in worker threads.
+
+    Args:
+        file (str): Excel file to read.
+
+    Returns:
+        dict[str, pd.DataFrame]: Dictionary with worksheet names as keys and DataFrames as values.
+    """
+
+    return pd.read_excel(
+        file, sheet_name=None, dtype="string", engine=EXCEL_READ_ENGINE
+    )
+
+
 # --------------------------------------------------------------
 class DataHandler:
     def __init__(self, config: cm.Config, log: logging.Logger) -> None:
@@ -587,7 +617,7 @@ class DataHandler:
 
         """
 
-        df_columns = set(df.columns.tolist())
+        df_columns = frozenset(df.columns)
 
         distance = {
             k: float("inf") for k in self.config.expected_columns_in_files.keys()
@@ -602,8 +632,9 @@ class DataHandler:
             # Required columns must be a subset of the DataFrame columns.
             # Smaller distance correspond to the dataframe that is the smaller superset of the required columns.
             # An empty column list will be a subset to all tables and the table with smallest number of columns will be returned.
+            # Since required columns are a subset, the distance is the difference in set sizes, without building the difference set.
             if required_columns.issubset(df_columns):
-                distance[table] = len(df_columns - required_columns)
+                distance[table] = len(df_columns) - len(required_columns)
 
         # Find the table with minimum distance value
         min_distance_value = min(distance.values())
@@ -786,7 +817,10 @@ class DataHandler:
 
     # --------------------------------------------------------------
     def read_metadata(
-        self, file: str, suggested_table: str
+        self,
+        file: str,
+        suggested_table: str,
+        sheets: dict[str, pd.DataFrame] | None = None,
     ) -> tuple[dict[str, pd.DataFrame], dict[str, list]]:
         """Read an metadata file and return a list of tuples with the DataFrame and the columns in the DataFrame.
         The file can be an Excel file, a CSV file or a JSON file.
@@ -794,6 +828,7 @@ class DataHandler:
         Args:
             file (str): Excel file to read.
             suggested_table (str): Name of the table associated with the file.
+            sheets (dict[str, pd.DataFrame] | None): Worksheets of an Excel file already read by read_excel_sheets. If None, the file is read here.
 
         Returns:
             dict[str,pd.DataFrame]: Dictionary with the DataFrames containing various tables.
@@ -811,67 +846,62 @@ class DataHandler:
         try:
             match file_extension:
                 case ".xlsx":
-                    # Read all worksheets from Excel file
-                    with pd.ExcelFile(file) as excel_file:
-                        sheet_names = excel_file.sheet_names
+                    # Read all worksheets from Excel file, unless already read in advance
+                    if sheets is None:
+                        sheets = read_excel_sheets(file)
 
-                        # create a copy of sheet_names to avoid modifying the original list with the for loop
-                        sheets_pending_to_read = sheet_names.copy()
+                    sheet_names = list(sheets.keys())
 
-                        # If there are multiple worksheets
-                        if len(sheet_names) > 1:
-                            self.log.info(
-                                f"XLSX file {file} contains multiple worksheets: {sheet_names}"
-                            )
+                    # create a copy of sheet_names to avoid modifying the original list with the for loop
+                    sheets_pending_to_read = sheet_names.copy()
 
-                            # Process each worksheet separately.
-                            for sheet_name in sheet_names:
-                                table = self.config.sheet_names.get(
-                                    str(sheet_name), str(sheet_name)
-                                )
+                    # If there are multiple worksheets
+                    if len(sheet_names) > 1:
+                        self.log.info(
+                            f"XLSX file {file} contains multiple worksheets: {sheet_names}"
+                        )
 
-                                if table in new_data_df.keys():
-                                    # Read the worksheet into a DataFrame
-                                    new_df = excel_file.parse(
-                                        sheet_name, dtype="string"
-                                    )
+                        # Process each worksheet separately.
+                        for sheet_name in sheet_names:
+                            table = self.config.sheet_names.get(
+                                str(sheet_name), str(sheet_name)
+                            )
 
-                                    # Process the worksheet data
-                                    new_df, columns, table = self.process_table(
-                                        df=new_df, table=table, file=file
-                                    )
-                                    if table == NO_TABLE_FOUND:
-                                        self.log.warning(
-                                            f"Worksheet '{sheet_name}' in file {file} could not be associated with any table. Skipping."
-                                        )
-                                        continue
-                                    new_data_df[table] = new_df
-                                    new_data_columns[table] = columns
-
-                                    # remove the processed sheet name from the list of new_data_df
-                                    sheets_pending_to_read.remove(sheet_name)
-
-                        if sheets_pending_to_read:
-                            if len(sheets_pending_to_read) == 1:
-                                if (
-                                    self.config.default_worksheet_key
-                                    in self.config.table_names.keys()
-                                ) or self.config.force_table_identification:
-                                    self.log.debug(
-                                        f"Remaining data in file {file} will be added default table."
-                                    )
-                                    new_df = excel_file.parse(
-                                        sheets_pending_to_read[0], dtype="string"
-                                    )
-                                    add_remaining_data = True
-                                else:
+                            if table in new_data_df.keys():
+                                # Process the worksheet data
+                                new_df, columns, table = self.process_table(
+                                    df=sheets[sheet_name], table=table, file=file
+                                )
+                                if table == NO_TABLE_FOUND:
                                     self.log.warning(
-                                        f"Some data in file {file} could not be associated with any table and will be ignored."
+                                        f"Worksheet '{sheet_name}' in file {file} could not be associated with any table. Skipping."
                                     )
+                                    continue
+                                new_data_df[table] = new_df
+                                new_data_columns[table] = columns
+
+                                # remove the processed sheet name from the list of new_data_df
+                                sheets_pending_to_read.remove(sheet_name)
+
+                    if sheets_pending_to_read:
+                        if len(sheets_pending_to_read) == 1:
+                            if (
+                                self.config.default_worksheet_key
+                                in self.config.table_names.keys()
+                            ) or self.config.force_table_identification:
+                                self.log.debug(
+                                    f"Remaining data in file {file} will be added default table."
+                                )
+                                new_df = sheets[sheets_pending_to_read[0]]
+                                add_remaining_data = True
                             else:
                                 self.log.warning(
-                                    "Multiple worksheets in file {file}. Check configuration to include table names to all worksheets."
+                                    f"Some data in file {file} could not be associated with any table and will be ignored."
                                 )
+                        else:
+                            self.log.warning(
+                                "Multiple worksheets in file {file}. Check configuration to include table names to all worksheets."
+                            )
 
                 case ".csv":
                     # Detect encoding first
@@ -1380,17 +1410,11 @@ class DataHandler:
         """
         df = new_data_df.get(table, pd.DataFrame())
 
-        # Find common indexes between new data and reference data
-        common_indexes = df.index.intersection(self.ref_df[table].index)
+        # Flag rows already in the reference data with a single index lookup. Boolean selection already returns copies
+        in_reference = df.index.isin(self.ref_df[table].index)
 
-        if common_indexes.empty:
-            # Set rows to update empty and copy all rows to add
-            update_df = pd.DataFrame(columns=df.columns)
-            add_df = df.copy()
-        else:
-            # Set rows to update as the intersection and the remaining as rows to add
-            update_df = df.loc[common_indexes].copy()
-            add_df = df.drop(common_indexes).copy()
+        update_df = df[in_reference]
+        add_df = df[~in_reference]
 
         return update_df, add_df
 
@@ -1614,7 +1638,7 @@ class DataHandler:
             None
         """
 
-        # apply updates using combine_first method
+        # apply updates in place. Rows in update_df already exist in the reference data, so no new rows or realignment are needed
         if not update_df.empty:
             try:
                 self.log.debug(f"Updating {update_df.shape[0]} rows in table {table}")
@@ -1623,7 +1647,14 @@ class DataHandler:
                     self.ref_df[table], update_df
                 )
 
-                self.ref_df[table] = update_df.combine_first(self.ref_df[table])
+                try:
+                    self.ref_df[table].update(update_df)
+                except (TypeError, ValueError) as e:
+                    # in place update fails if a value does not fit the column dtype or the index is not unique. Fall back to combine_first
+                    self.log.debug(
+                        f"In place update not possible for table {table}. Using combine_first: {e}"
+                    )
+                    self.ref_df[table] = update_df.combine_first(self.ref_df[table])
 
             except Exception as e:
                 self.log.error(
@@ -1744,14 +1775,16 @@ class DataHandler:
             # Get file modification time and convert to UTC ISO 8601 format
             try:
                 mtime = os.path.getmtime(file)
-                timestamp = pd.Timestamp(mtime, unit="s", tz="UTC").strftime(
-                    "%Y-%m-%dT%H:%M:%SZ"
-                )
+                timestamp = datetime.datetime.fromtimestamp(
+                    mtime, tz=datetime.UTC
+                ).strftime("%Y-%m-%dT%H:%M:%SZ")
             except (OSError, FileNotFoundError) as e:
                 self.log.warning(
                     f"Could not retrieve timestamp for file `{file}`: {e}. Using current time."
                 )
-                timestamp = pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
+                timestamp = datetime.datetime.now(tz=datetime.UTC).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                )
 
             if df.empty:
                 # Create a new DataFrame with one row for empty DataFrames
@@ -1933,35 +1966,70 @@ class DataHandler:
 
         files_to_move_to_store = []
 
-        for table_associated_file, files in metadata_files.items():
-            for file in files:
-                new_data_df, column_in = self.read_metadata(
-                    file=file, suggested_table=table_associated_file
-                )
+        # read Excel files in worker threads, overlapping file access and parsing with the processing of previous files
+        excel_files = [
+            file
+            for files in metadata_files.values()
+            for file in files
+            if os.path.splitext(file)[1] == ".xlsx"
+        ]
+        excel_reader = None
+        sheets_read = {}
+        excel_to_read = iter(excel_files)
+        if len(excel_files) > 1:
+            # workbooks are read only a few files ahead, so memory use does not grow with the batch size
+            read_ahead = min(len(excel_files), os.cpu_count() or 1)
+            excel_reader = ThreadPoolExecutor(max_workers=read_ahead)
+            for file in itertools.islice(excel_to_read, read_ahead):
+                sheets_read[file] = excel_reader.submit(read_excel_sheets, file)
 
-                self.log.info(f"Processing metadata file: {file}")
+        try:
+            for table_associated_file, files in metadata_files.items():
+                for file in files:
+                    sheets = None
+                    if file in sheets_read:
+                        sheets_future = sheets_read.pop(file)
+                        next_file = next(excel_to_read, None)
+                        if next_file is not None:
+                            sheets_read[next_file] = excel_reader.submit(
+                                read_excel_sheets, next_file
+                            )
+                        try:
+                            sheets = sheets_future.result()
+                        except Exception:
+                            # read again in read_metadata, where errors are handled
+                            sheets = None
+
+                    new_data_df, column_in = self.read_metadata(
+                        file=file, suggested_table=table_associated_file, sheets=sheets
+                    )
 
-                # If data was loaded, put the file in the list to be moved to store, otherwise may move it to trash
-                trash_file = True
-                for df in new_data_df.values():
-                    if not df.empty:
-                        files_to_move_to_store.append(file)
-                        trash_file = False
-                        break
+                    self.log.info(f"Processing metadata file: {file}")
 
-                if self.config.discard_invalid_data_files and trash_file:
-                    self.file.trash_it(
-                        file=file, overwrite=self.config.trash_data_overwrite
-                    )
-                    continue
+                    # If data was loaded, put the file in the list to be moved to store, otherwise may move it to trash
+                    trash_file = True
+                    for df in new_data_df.values():
+                        if not df.empty:
+                            files_to_move_to_store.append(file)
+                            trash_file = False
+                            break
 
-                # Compute the new column order for the reference DataFrame
-                self.ref_cols = self.merge_dicts(
-                    new_dict=column_in, legacy_dict=self.ref_cols
-                )
+                    if self.config.discard_invalid_data_files and trash_file:
+                        self.file.trash_it(
+                            file=file, overwrite=self.config.trash_data_overwrite
+                        )
+                        continue
+
+                    # Compute the new column order for the reference DataFrame
+                    self.ref_cols = self.merge_dicts(
+                        new_dict=column_in, legacy_dict=self.ref_cols
+                    )
 
-                # Update reference data with new data from the file
-                self.update_reference_data(new_data_df=new_data_df, file=file)
+                    # Update reference data with new data from the file
+                    self.update_reference_data(new_data_df=new_data_df, file=file)
+        finally:
+            if excel_reader is not None:
+                excel_reader.shutdown(cancel_futures=True)
 
         if files_to_move_to_store:
             if self.persist_reference():
@@ -1972,6 +2040,59 @@ class DataHandler:
                     k: set() for k in self.config.data_file_regex.keys()
                 }
 
+    # --------------------------------------------------------------
+    def _index_filename_column(
+        self, column: pd.Series
+    ) -> tuple[str, list[int], pd.Index]:
+        """Join the values of a data filename column into a single text, to search a filename in all rows with a single find.
+
+        Args:
+            column (pd.Series): Column with the data filenames of a reference table.
+
+        Returns:
+            str: Column values joined by line breaks.
+            list[int]: Position in the text where each row value starts.
+            pd.Index: Index labels of the rows, in the same order.
+        """
+
+        values = column.dropna().astype(str)
+
+        starts = list(
+            itertools.accumulate((len(value) + 1 for value in values), initial=0)
+        )
+        starts.pop()
+
+        return "\n".join(values), starts, values.index
+
+    # --------------------------------------------------------------
+    def _find_filename_rows(
+        self, lookup: tuple[str, list[int], pd.Index], filename: str
+    ) -> pd.Index:
+        """Find the rows in which the filename is contained, using a lookup built by _index_filename_column.
+
+        Args:
+            lookup (tuple[str, list[int], pd.Index]): Joined text, row start positions and row index labels.
+            filename (str): Filename to search for.
+
+        Returns:
+            pd.Index: Index labels of the rows containing the filename.
+        """
+
+        text, starts, index = lookup
+
+        rows = []
+        position = text.find(filename)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            rows.append(row)
+
+            # continue the search from the next row, since the current row is already matched
+            if row + 1 == len(starts):
+                break
+            position = text.find(filename, starts[row + 1])
+
+        return index[rows]
+
     # --------------------------------------------------------------
     def process_data_files(self, files_to_process: dict[str, set[str]]) -> None:
         """Process the set of data files and update the reference metadata file, if necessary.
@@ -1984,6 +2105,8 @@ class DataHandler:
         Returns: None
         """
         files_not_counted = {}
+        files_to_publish = {}
+        filename_lookups = {}
 
         for target_folder_key, file_set in files_to_process.items():
             if file_set is None or not file_set:
@@ -1997,6 +2120,7 @@ class DataHandler:
             for file in file_set:
                 self.log.debug(f"Processing data file: {file}")
 
+                filename = os.path.basename(file)
                 table_not_found = True
 
                 for table in self.ref_df.keys():
@@ -2014,17 +2138,21 @@ class DataHandler:
                             )
                             continue
 
-                        match = self.ref_df[table][
-                            self.ref_df[table][column].str.contains(
-                                os.path.basename(file)
+                        # index the column once per call, since filename columns are not changed here
+                        if (table, column) not in filename_lookups:
+                            filename_lookups[(table, column)] = (
+                                self._index_filename_column(self.ref_df[table][column])
                             )
-                        ]
 
-                        if not match.empty:
+                        match_index = self._find_filename_rows(
+                            filename_lookups[(table, column)], filename
+                        )
+
+                        if not match_index.empty:
                             for status_column in self.config.columns_data_published[
                                 table
                             ]:
-                                self.ref_df[table].loc[match.index, status_column] = (
+                                self.ref_df[table].loc[match_index, status_column] = (
                                     "True"
                                 )
                                 files_found_in_ref.add(file)
@@ -2043,16 +2171,50 @@ class DataHandler:
                 )
 
             if files_found_in_ref:
-                if self.persist_reference():
-                    if self.file.publish_data_file(
-                        files_found_in_ref, target_folder_key
-                    ):
-                        self.file.remove_file_list(files_found_in_ref)
+                files_to_publish[target_folder_key] = files_found_in_ref
 
             if files_to_move_only:
                 if self.file.publish_data_file(files_to_move_only, target_folder_key):
                     self.file.remove_file_list(files_to_move_only)
 
+        # persist the reference data once for all target folders, then publish the files found in it
+        if files_to_publish and self.persist_reference():
+            for target_folder_key, files_found_in_ref in files_to_publish.items():
+                if self.file.publish_data_file(files_found_in_ref, target_folder_key):
+                    self.file.remove_file_list(files_found_in_ref)
+
+    # --------------------------------------------------------------
+    def _write_excel(self, catalog_file: str, df: dict[str, pd.DataFrame]) -> None:
+        """Write each table to a separate sheet of an Excel file.
+
+        Rows are streamed to disk using openpyxl write-only mode, instead of building every cell of the workbook in memory.
+
+        Args:
+            catalog_file (str): Path to the Excel file to be written.
+            df (dict[str,pd.DataFrame]): Dictionary with the DataFrames to be written, keyed by table.
+
+        Returns: None
+
+        Raises:
+            ValueError: If there is no table to be written.
+        """
+
+        if not df:
+            raise ValueError("No table to write")
+
+        workbook = Workbook(write_only=True)
+
+        for table, table_df in df.items():
+            worksheet = workbook.create_sheet(title=self.config.table_names[table])
+            worksheet.append([str(column) for column in table_df.columns])
+
+            # missing values are written as empty cells
+            values = table_df.astype(object).where(table_df.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                worksheet.append(row)
+
+        workbook.save(catalog_file)
+
     # --------------------------------------------------------------
     def persist_reference(self) -> bool:
         """Persist the reference DataFrame to the catalog file.
@@ -2066,13 +2228,38 @@ class DataHandler:
         df = {}
         for table in self.ref_df.keys():
             try:
-                df[table] = self.ref_df[table].sort_values(
-                    by=self.config.rows_sort_by[table][cm.SORT_BY_KEY],
-                    ascending=self.config.rows_sort_by[table][cm.ASCENDING_SORT_KEY],
-                    ignore_index=True,
+                sort_by = self.config.rows_sort_by[table][cm.SORT_BY_KEY]
+
+                # sort only the sorting columns to get the row order, then take rows and output columns with a single copy
+                row_order = (
+                    self.ref_df[table][sort_by]
+                    .reset_index(drop=True)
+                    .sort_values(
+                        by=sort_by,
+                        ascending=self.config.rows_sort_by[table][
+                            cm.ASCENDING_SORT_KEY
+                        ],
+                    )
+                    .index
                 )
+                column_order = self.ref_df[table].columns.get_indexer(
+                    self.ref_cols[table]
+                )
+                if (column_order < 0).any():
+                    missing_columns = [
+                        column
+                        for column, index in zip(self.ref_cols[table], column_order)
+                        if index < 0
+                    ]
+                    column_order = column_order[column_order >= 0]
+                    if len(column_order) == 0:
+                        column_order = slice(None)
+                    self.log.warning(
+                        f"Columns not found in table '{table}': {missing_columns}. Only the existing columns will be saved."
+                    )
 
-                df[table] = df[table][self.ref_cols[table]]
+                df[table] = self.ref_df[table].iloc[row_order, column_order]
+                df[table].index = pd.RangeIndex(len(df[table]))
             except Exception as e:
                 if self.ref_df[table].empty:
                     self.log.debug(f"Table '{table}' is empty. Will not be saved.")
@@ -2083,7 +2270,11 @@ class DataHandler:
                     self.log.warning(
                         f"Table '{table}' has has no sorting or ordering defined. Will be kept as it is."
                     )
-                    df[table] = self.ref_df[table]
+                else:
+                    self.log.warning(
+                        f"Table '{table}' could not be sorted: {e}. Will be kept as it is."
+                    )
+                df[table] = self.ref_df[table]
 
         # loop through the target catalog files and save the reference data,
         # ensuring that at least one file is saved successfully before returning True
@@ -2098,14 +2289,7 @@ class DataHandler:
             match extension:
                 case ".xlsx":
                     try:
-                        with pd.ExcelWriter(catalog_file, engine="openpyxl") as writer:
-                            # Write each table to a separate sheet in the Excel file
-                            for table in df.keys():
-                                df[table].to_excel(
-                                    writer,
-                                    sheet_name=self.config.table_names[table],
-                                    index=False,
-                                )
+                        self._write_excel(catalog_file, df)
                         self.log.info(
                             f"Excel reference data file updated: {catalog_file}"
                         )
@@ -2193,12 +2377,19 @@ class DataHandler:
                             else:
                                 parquet_file = f"{base_name}_{table}.parquet"
 
-                            df[table].to_parquet(parquet_file, index=False)
+                            df[table].to_parquet(
+                                parquet_file, index=False, compression="zstd"
+                            )
                             self.log.info(
                                 f"Parquet reference data file updated: {parquet_file}"
                             )
-                        save_multiple_files = True
-                        # TODO: allow start from parquet:  save_at_least_one = True
+
+                        # a single table is saved in the catalog file itself and can be read back by read_reference_df
+                        if len(tables) == 1:
+                            save_at_least_one = True
+                        else:
+                            save_multiple_files = True
+                        # TODO: allow start from multiple parquet files:  save_at_least_one = True
                     except Exception as e:
                         self.log.error(f"Error saving Parquet '{parquet_file}': {e}")
 